@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class BlogConfig(AppConfig):
+    """Конфигурация приложения Blog."""
+
+    default_auto_field: str = 'django.db.models.BigAutoField'
+    name: str = 'blog'
+
+    def ready(self):
+        from django.conf import settings
+        from PIL import Image
+
+        from . import checks, signals  # noqa: F401
+
+        # Pillow откажется открывать картинки больше этого предела.
+        Image.MAX_IMAGE_PIXELS = settings.POST_IMAGE_MAX_PIXELS
@@ -0,0 +1,165 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db.models import Min
+from django.utils import timezone, translation
+from django.utils.cache import get_conditional_response
+
+from core.routers import use_primary
+
+
+def get_version(name):
+    """Текущая версия группы ключей кэша.
+
+    Если версия вытеснена из кэша, новая начинается с текущего времени,
+    чтобы не совпасть ни с одной из уже использованных.
+    """
+    versions = caches[settings.VERSION_CACHE]
+    version = versions.get(f'version:{name}')
+    if version is None:
+        versions.add(f'version:{name}', time.time_ns(), None)
+        version = versions.get(f'version:{name}')
+    return version
+
+
+def bump_version(name):
+    """Инвалидирует группу ключей кэша сменой её версии.
+
+    Версия — время смены в наносекундах, чтобы `recently_bumped`
+    мог отличить только что сменённую версию.
+    """
+    versions = caches[settings.VERSION_CACHE]
+    key = f'version:{name}'
+    versions.set(key, max(time.time_ns(), (versions.get(key) or 0) + 1), None)
+
+
+def recently_bumped(name):
+    """Сменилась ли версия за последние REPLICA_STICKY_SECONDS."""
+    age = time.time_ns() - get_version(name)
+    return age < settings.REPLICA_STICKY_SECONDS * 10 ** 9
+
+
+def may_cache(obj, name):
+    """Можно ли положить в кэш группы name данные, прочитанные в obj.
+
+    Сразу после смены версии реплика может ещё не видеть изменение,
+    из-за которого версию сменили. Прочитанное с неё в кэш
+    не кладётся, иначе устаревшие данные прожили бы весь таймаут
+    под новой версией.
+    """
+    return (
+        obj._state.db not in settings.DATABASE_REPLICAS
+        or not recently_bumped(name)
+    )
+
+
+def feed_count_key(*parts):
+    """Ключ кэша с числом постов в ленте."""
+    version = get_version('feed_count')
+    return ':'.join(map(str, ('feed_count', version, *parts)))
+
+
+def seconds_until_next_publication(queryset, timeout):
+    """Сокращает timeout до ближайшей отложенной публикации в queryset."""
+    next_pub_date = queryset.filter(
+        is_published=True, pub_date__gt=timezone.now()
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    if next_pub_date is None:
+        return timeout
+    delay = (next_pub_date - timezone.now()).total_seconds()
+    return max(1, min(timeout, int(delay) + 1))
+
+
+def feed_count_timeout(queryset):
+    """Время жизни закэшированного числа постов ленты.
+
+    Отложенная публикация меняет число постов без сохранения модели,
+    поэтому значение живёт не дольше, чем до ближайшей из них.
+    """
+    return seconds_until_next_publication(
+        queryset.model._default_manager.all(), settings.FEED_COUNT_TIMEOUT
+    )
+
+
+def post_card_key(post):
+    """Ключ кэша отрендеренной карточки поста."""
+    return ':'.join(map(str, (
+        'post_card',
+        get_version('post_card'),
+        post.pk,
+        post.updated_at.timestamp(),
+        post.comment_count,
+        translation.get_language(),
+        timezone.get_current_timezone_name(),
+    )))
+
+
+def page_cache_key(request):
+    """Ключ кэша страницы ленты для анонимного посетителя."""
+    return ':'.join(map(str, (
+        'page',
+        get_version('page'),
+        request.path,
+        request.GET.get('page', ''),
+        request.GET.get('cursor', ''),
+        translation.get_language(),
+    )))
+
+
+def count_page_cache(outcome):
+    """Увеличивает счётчик попаданий или промахов кэша страниц."""
+    key = f'page_cache:{outcome}'
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def page_cache_stats():
+    """Счётчики попаданий и промахов кэша страниц."""
+    stats = cache.get_many(('page_cache:hit', 'page_cache:miss'))
+    return {
+        'hit': stats.get('page_cache:hit', 0),
+        'miss': stats.get('page_cache:miss', 0),
+    }
+
+
+def cache_anonymous_page(get_feed):
+    """Кэширует страницу ленты для анонимных GET-запросов.
+
+    `get_feed` принимает аргументы view и возвращает queryset постов
+    ленты без фильтра по дате: страница живёт в кэше не дольше, чем
+    до ближайшей отложенной публикации в этой ленте.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(request)
+            response = cache.get(key)
+            if response is not None:
+                count_page_cache('hit')
+                response['X-Page-Cache'] = 'HIT'
+                return get_conditional_response(
+                    request, etag=response.get('ETag'), response=response
+                )
+            count_page_cache('miss')
+            # Страница ляжет в кэш под новой версией: реплика, отстающая
+            # от только что сменившей версию записи, для неё не годится.
+            with use_primary():
+                response = view(request, *args, **kwargs)
+                if (response.status_code == 200
+                        and not request.META.get('CSRF_COOKIE_USED')):
+                    response['X-Page-Cache'] = 'MISS'
+                    cache.set(key, response, seconds_until_next_publication(
+                        get_feed(*args, **kwargs),
+                        settings.PAGE_CACHE_TIMEOUT
+                    ))
+            return response
+        return wrapper
+    return decorator
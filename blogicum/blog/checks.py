@@ -0,0 +1,101 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import checks
+from django.db import DatabaseError, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+from core.constants import POSTS_TO_DISPLAY
+from .models import Comment, Post
+
+User = get_user_model()
+
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+CHECKED_TABLES = {Post._meta.db_table, Comment._meta.db_table}
+
+
+def hot_querysets():
+    """Запросы, которые выполняются на каждой странице ленты.
+
+    Собираются теми же функциями, что и во view, и в том виде,
+    в каком их выполняет пагинатор: `for_cards()` и LIMIT страницы.
+    """
+    from .views import (
+        get_category_posts, get_index_posts, get_profile_posts
+    )
+
+    author = User(pk=0)
+    feeds = {
+        'лента': get_index_posts(),
+        'лента категории': get_category_posts('slug'),
+        'профиль автора': get_profile_posts(author, AnonymousUser()),
+        'свой профиль': get_profile_posts(author, author),
+    }
+    return {
+        **{
+            name: posts.for_cards()[:POSTS_TO_DISPLAY]
+            for name, posts in feeds.items()
+        },
+        'комментарии поста': Comment.objects.filter(
+            post_id=0
+        ).select_related('author'),
+    }
+
+
+def explain(queryset, connection):
+    """Текстовый план запроса в терминах СУБД."""
+    sql, params = queryset.query.sql_with_params()
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # На маленьких таблицах Postgres выберет Seq Scan и при
+                # наличии индекса, поэтому проверяем, применим ли индекс.
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}', params)
+            else:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+def full_scans(queryset, connection):
+    """Таблицы, которые план запроса читает полным перебором."""
+    pattern = FULL_SCAN_PATTERNS[connection.vendor]
+    return {
+        table for table in pattern.findall(explain(queryset, connection))
+        if table in CHECKED_TABLES
+    }
+
+
+@checks.register(checks.Tags.database)
+def check_feed_query_plans(app_configs=None, databases=None, **kwargs):
+    """Проверяет, что горячие запросы лент используют индексы."""
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor not in FULL_SCAN_PATTERNS:
+            continue
+        executor = MigrationExecutor(connection)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            # Индексы ещё не созданы: проверка имеет смысл после migrate.
+            continue
+        for name, queryset in hot_querysets().items():
+            try:
+                tables = full_scans(queryset, connection)
+            except DatabaseError as error:
+                errors.append(checks.Warning(
+                    f'Не удалось получить план запроса «{name}»: {error}',
+                    id='blog.W001',
+                ))
+                continue
+            if tables:
+                errors.append(checks.Error(
+                    f'Запрос «{name}» читает {", ".join(sorted(tables))} '
+                    'полным перебором.',
+                    hint='Проверьте индексы в Meta.indexes моделей блога.',
+                    id='blog.E001',
+                ))
+    return errors
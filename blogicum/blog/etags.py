@@ -0,0 +1,54 @@
+import hashlib
+
+from django.utils import translation
+
+from .caching import get_version
+from .pagitane import page_keys
+
+
+def make_etag(request, *parts):
+    """Строит ETag из версии данных страницы и личности посетителя."""
+    viewer = request.user.pk if request.user.is_authenticated else 'anon'
+    raw = ':'.join(map(str, (
+        viewer,
+        get_version('post_card'),
+        translation.get_language(),
+        *parts,
+    )))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def feed_etag(request, page):
+    """Строит ETag ленты по постам её страницы.
+
+    Берутся только pk и время изменения постов окна страницы, а число
+    постов — из кэша пагинатора: на 304 view не выполняет ни запроса
+    карточек, ни COUNT по всей ленте.
+    """
+    keys = page_keys(page)
+    return make_etag(
+        request,
+        get_version('feed_count'),
+        getattr(page.paginator, 'count', ''),
+        max((updated_at for _, updated_at in keys), default=''),
+        ','.join(str(pk) for pk, _ in keys),
+        page.has_previous(),
+        page.has_next(),
+    )
+
+
+def post_updated_at(request, posts):
+    """Время изменения поста; запрос выполняется раз на запрос клиента."""
+    if not hasattr(request, '_post_updated_at'):
+        request._post_updated_at = posts.values_list(
+            'updated_at', flat=True
+        ).first()
+    return request._post_updated_at
+
+
+def post_etag(request, posts):
+    """Строит ETag страницы поста, включая его комментарии."""
+    updated_at = post_updated_at(request, posts)
+    if updated_at is None:
+        return None
+    return make_etag(request, updated_at)
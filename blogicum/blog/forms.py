@@ -1,5 +1,8 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
 
 from .models import Comment, Post
 
@@ -20,12 +23,50 @@ class CommentForm(forms.ModelForm):
         fields = ['text']
 
 
+class LimitedImageField(forms.ImageField):
+    """Поле изображения с ограничением размера файла и числа пикселей.
+
+    Размеры картинки читаются из заголовка до полной проверки Pillow,
+    поэтому «бомба декомпрессии» отклоняется без декодирования.
+    """
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        if data.size > settings.POST_IMAGE_MAX_SIZE:
+            raise forms.ValidationError(
+                'Размер файла не должен превышать %(limit)s.',
+                code='file_too_large',
+                params={'limit': filesizeformat(settings.POST_IMAGE_MAX_SIZE)},
+            )
+        try:
+            with Image.open(data) as image:
+                pixels = image.width * image.height
+        except Image.DecompressionBombError:
+            pixels = settings.POST_IMAGE_MAX_PIXELS + 1
+        except OSError:
+            # Не картинка: ошибку сообщит проверка ImageField.
+            pixels = 0
+        finally:
+            data.seek(0)
+        if pixels > settings.POST_IMAGE_MAX_PIXELS:
+            raise forms.ValidationError(
+                'Изображение не должно быть больше %(limit)s пикселей.',
+                code='too_many_pixels',
+                params={'limit': settings.POST_IMAGE_MAX_PIXELS},
+            )
+        return super().to_python(data)
+
+
 class PostForm(forms.ModelForm):
     """Форма для поста."""
 
     class Meta:
         model = Post
         exclude = ('author',)
+        field_classes = {
+            'image': LimitedImageField,
+        }
         widgets = {
             'text': forms.Textarea(),
             'comment': forms.Textarea(),
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    """Заполняет сохранённое начало текста постов."""
+
+    help = 'Пересчитывает Post.excerpt для всех постов пакетами.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько постов обновлять одним запросом.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        changed = []
+        updated = 0
+        posts = Post.objects.only('pk', 'text', 'excerpt')
+        for post in posts.iterator(chunk_size=batch_size):
+            excerpt = Post.make_excerpt(post.text)
+            if post.excerpt == excerpt:
+                continue
+            post.excerpt = excerpt
+            changed.append(post)
+            if len(changed) == batch_size:
+                Post.objects.bulk_update(changed, ['excerpt'])
+                updated += len(changed)
+                changed = []
+        Post.objects.bulk_update(changed, ['excerpt'])
+        updated += len(changed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено постов: {updated}'
+        ))
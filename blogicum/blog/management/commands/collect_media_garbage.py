@@ -0,0 +1,67 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+from blog.storage import POST_IMAGE_DIR
+
+
+def walk(storage, path):
+    """Все файлы хранилища в каталоге path и его подкаталогах."""
+    directories, files = storage.listdir(path)
+    for name in files:
+        yield os.path.join(path, name)
+    for directory in directories:
+        yield from walk(storage, os.path.join(path, directory))
+
+
+def referenced_names():
+    """Имена изображений и их копий, на которые ссылаются посты."""
+    names = set()
+    posts = Post.objects.exclude(image='').values_list('image', 'renditions')
+    for image, renditions in posts.iterator():
+        names.add(image)
+        for formats in renditions.values():
+            if isinstance(formats, dict):
+                names.update(formats.values())
+    return names
+
+
+class Command(BaseCommand):
+    """Удаляет файлы изображений, на которые не ссылается ни один пост."""
+
+    help = 'Удаляет из хранилища изображения, не привязанные к постам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=24 * 60 * 60,
+            help='Не трогать файлы моложе стольких секунд: их могут'
+                 ' сохранять прямо сейчас.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+
+    def handle(self, *args, grace, dry_run, **options):
+        storage = Post._meta.get_field('image').storage
+        if not storage.exists(POST_IMAGE_DIR):
+            return
+        referenced = referenced_names()
+        deadline = timezone.now() - timedelta(seconds=grace)
+        garbage = [
+            name for name in walk(storage, POST_IMAGE_DIR)
+            if name not in referenced
+            and storage.get_modified_time(name) < deadline
+        ]
+        for name in garbage:
+            if dry_run:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Будет удалено" if dry_run else "Удалено"} файлов:'
+            f' {len(garbage)}'
+        ))
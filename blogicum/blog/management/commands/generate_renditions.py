@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.renditions import generate_renditions
+
+
+class Command(BaseCommand):
+    """Создаёт уменьшенные копии изображений постов."""
+
+    help = 'Создаёт копии изображений для постов, у которых их ещё нет.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии и для постов, у которых они уже есть.'
+        )
+
+    def handle(self, *args, force, **options):
+        posts = Post.objects.exclude(image='')
+        if not force:
+            posts = posts.filter(renditions={})
+        done = 0
+        for post in posts.iterator():
+            try:
+                generate_renditions(post)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Пост {post.pk}: {error}')
+                continue
+            done += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано постов: {done}'
+        ))
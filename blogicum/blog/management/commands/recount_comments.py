@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.querysets import recount_comments
+
+
+class Command(BaseCommand):
+    """Пересчитывает денормализованный счётчик комментариев постов."""
+
+    help = 'Исправляет расхождения Post.comment_count с числом комментариев.'
+
+    def handle(self, *args, **options):
+        fixed = recount_comments(Post.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено постов: {fixed}'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+    ]
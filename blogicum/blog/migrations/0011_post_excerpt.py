@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-17 17:15
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 500
+
+
+def fill_excerpt(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    batch = []
+    for post in posts.only('pk', 'text').iterator(BATCH_SIZE):
+        post.excerpt = Truncator(Truncator(post.text).words(10)).chars(512)
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            posts.bulk_update(batch, ['excerpt'])
+            batch = []
+    posts.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=512, verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
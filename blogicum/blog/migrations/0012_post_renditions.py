@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+    ]
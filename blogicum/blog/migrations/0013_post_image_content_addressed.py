@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-17 17:19
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.storage.ContentAddressedStorage(), upload_to='posts', verbose_name='Изображение'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# BRIN-индексы занимают килобайты и подходят столбцам, значения которых
+# растут вместе с физическим порядком строк. Они есть только в PostgreSQL,
+# поэтому создаются вне Meta.indexes и пропускаются на других СУБД.
+BRIN_INDEXES = (
+    ('Post', 'pub_date', 'post_pub_date_brin'),
+    ('Comment', 'created_at', 'comment_created_brin'),
+)
+
+
+def brin_indexes(apps):
+    from django.contrib.postgres.indexes import BrinIndex
+
+    for model_name, field, name in BRIN_INDEXES:
+        yield (
+            apps.get_model('blog', model_name),
+            BrinIndex(fields=[field], name=name, autosummarize=True),
+        )
+
+
+def add_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in brin_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def remove_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model, index in brin_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_post_image_content_addressed'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_brin_indexes, remove_brin_indexes),
+    ]
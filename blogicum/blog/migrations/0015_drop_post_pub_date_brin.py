@@ -0,0 +1,43 @@
+from django.db import migrations
+
+# Отложенные публикации получают pub_date в будущем, и даты перестают
+# расти вместе с физическим порядком строк: диапазоны блоков BRIN
+# перекрываются, и индекс почти ничего не отсекает. Ленты по pub_date
+# обслуживают B-tree индексы из 0008_feed_indexes.
+# У комментариев created_at задаётся при вставке, их BRIN остаётся.
+INDEX_NAME = 'post_pub_date_brin'
+
+
+def post_pub_date_brin():
+    from django.contrib.postgres.indexes import BrinIndex
+
+    return BrinIndex(
+        fields=['pub_date'], name=INDEX_NAME, autosummarize=True
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(
+        apps.get_model('blog', 'Post'), post_pub_date_brin()
+    )
+
+
+def restore_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.add_index(
+        apps.get_model('blog', 'Post'), post_pub_date_brin()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_postgres_brin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_brin_index, restore_brin_index),
+    ]
@@ -1,40 +1,51 @@
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import redirect
 from django.urls import reverse_lazy
 
 from .forms import CommentForm, PostForm
 from .models import Post, Comment
 
 
-class PostFormMixin:
+class OwnerObjectMixin:
+    """Пускает к объекту только его автора.
+
+    Объект загружается в dispatch одним запросом, для проверки
+    сравнивается `author_id` без загрузки автора, а `get_object()`
+    возвращает уже загруженный экземпляр.
+    """
+
+    owned_object = None
+
+    def get_object(self, queryset=None):
+        if queryset is None and self.owned_object is not None:
+            return self.owned_object
+        return super().get_object(queryset)
+
+    def dispatch(self, request, *args, **kwargs):
+        self.owned_object = self.get_object()
+        if self.owned_object.author_id != request.user.pk:
+            return self.handle_not_owner()
+        return super().dispatch(request, *args, **kwargs)
+
+    def handle_not_owner(self):
+        return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
+
+
+class PostFormMixin(OwnerObjectMixin):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
     form_class = PostForm
     posts = None
 
-    def dispatch(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=kwargs.get('post_id'))
-        if post.author != request.user:
-            return redirect('blog:post_detail', self.kwargs.get('post_id'))
-        return super().dispatch(request, *args, **kwargs)
-
 
-class CommentMixin:
+class CommentMixin(OwnerObjectMixin):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
-    comment = None
-
-    def dispatch(self, request, *args, **kwargs):
-        comment_id = kwargs.get(self.pk_url_kwarg)
-        self.comment = get_object_or_404(self.model, pk=comment_id)
-        if self.comment.author != request.user:
-            return redirect('blog:post_detail', post_id=kwargs.get('post_id'))
-        return super().dispatch(request, *args, **kwargs)
 
     def get_success_url(self):
         return reverse_lazy(
             'blog:post_detail',
-            kwargs={'post_id': self.comment.post.pk}
+            kwargs={'post_id': self.object.post_id}
         )
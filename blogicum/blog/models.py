@@ -1,8 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.text import Truncator
 
-from core.constants import MAX_CHARACTERS, MAX_TITLE_LENGTH
+from core.constants import (
+    MAX_CHARACTERS, MAX_TITLE_LENGTH, POST_EXCERPT_LENGTH, POST_EXCERPT_WORDS
+)
 from core.models import PublishedModel
+from .querysets import PostQuerySet, deleting_posts
+from .renditions import RENDITION_WIDTHS
+from .storage import POST_IMAGE_DIR, ContentAddressedStorage
 
 
 User = get_user_model()
@@ -18,6 +24,12 @@ class Post(PublishedModel):
     text = models.TextField(
         verbose_name='Текст'
     )
+    excerpt = models.CharField(
+        max_length=POST_EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=('Если установить дату и время в будущем'
@@ -47,18 +59,91 @@ class Post(PublishedModel):
     )
     image = models.ImageField(
         blank=True,
+        upload_to=POST_IMAGE_DIR,
+        storage=ContentAddressedStorage(),
         verbose_name='Изображение'
     )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         """Дополнительные параметры для перевода."""
 
         verbose_name: str = 'публикация'
         verbose_name_plural: str = 'Публикации'
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_published=True),
+                name='post_published_date_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                condition=models.Q(is_published=True),
+                name='post_published_category_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_date_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title[:MAX_TITLE_LENGTH]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        # Отложенный text (например, после for_cards()) не загружается,
+        # если сохраняются другие поля.
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = self.make_excerpt(self.text)
+        if self.renditions.get('source') != self.image.name:
+            # Копии старого изображения больше не подходят.
+            self.renditions = {}
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        if update_fields is not None and 'image' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'renditions'}
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with deleting_posts():
+            return super().delete(*args, **kwargs)
+
+    @property
+    def srcset(self):
+        """Значения srcset по форматам копий изображения."""
+        srcset = {}
+        storage = self.image.storage
+        for key, width in RENDITION_WIDTHS.items():
+            for fmt, name in self.renditions.get(key, {}).items():
+                srcset.setdefault(fmt, []).append(
+                    f'{storage.url(name)} {width}w'
+                )
+        return {fmt: ', '.join(items) for fmt, items in srcset.items()}
+
+    @staticmethod
+    def make_excerpt(text):
+        """Начало текста для карточки поста в ленте."""
+        return Truncator(
+            Truncator(text).words(POST_EXCERPT_WORDS)
+        ).chars(POST_EXCERPT_LENGTH)
+
 
 class Category(PublishedModel):
     """Определяет свойства категорий."""
@@ -124,3 +209,9 @@ class Comment(PublishedModel):
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx',
+            ),
+        ]
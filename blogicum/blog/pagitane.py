@@ -1,10 +1,261 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 
 from core.constants import START_PAGE_NUM
+from core.routers import use_primary
+from .caching import feed_count_key, feed_count_timeout
+
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+def encode_cursor(post, direction=FORWARD):
+    """Кодирует позицию поста в непрозрачный токен для `?cursor=`."""
+    raw = f'{direction}{post.pub_date.isoformat()}|{post.pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Раскодирует токен курсора; для некорректного токена вернёт None."""
+    try:
+        raw = urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        direction, raw = raw[0], raw[1:]
+        pub_date, pk = raw.rsplit('|', 1)
+        if direction not in (FORWARD, BACKWARD):
+            return None
+        return direction, datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, IndexError, ValueError):
+        return None
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации.
+
+    Запрос выполняется лениво: ETag ленты берёт `keys` — только pk
+    и время изменения постов окна, без JOIN для карточек.
+    """
+
+    def __init__(self, paginator, queryset, has_previous, backward=False):
+        self.paginator = paginator
+        # Окно на один пост больше страницы: по нему видно has_next.
+        self._queryset = queryset[:paginator.per_page + 1]
+        self._has_previous = has_previous
+        self._backward = backward
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def _evaluate(self, keys=False):
+        """Строки страницы и флаги has_previous, has_next.
+
+        При `keys` вместо постов выбираются пары (pk, updated_at).
+        """
+        per_page = self.paginator.per_page
+        queryset = self._queryset
+        if keys:
+            queryset = queryset.values_list('pk', 'updated_at')
+        rows = list(queryset)
+        if not self._backward:
+            return (
+                rows[:per_page], self._has_previous, len(rows) > per_page
+            )
+        if len(rows) <= per_page:
+            # Дошли до начала ленты: показываем полную первую страницу.
+            return self.paginator.get_page()._evaluate(keys)
+        return rows[:per_page][::-1], True, True
+
+    @cached_property
+    def _page(self):
+        return self._evaluate()
+
+    @cached_property
+    def _keys(self):
+        return self._evaluate(keys=True)
+
+    def _state(self):
+        return self.__dict__.get('_page') or self._keys
+
+    @property
+    def object_list(self):
+        return self._page[0]
+
+    @property
+    def keys(self):
+        """Пары (pk, updated_at) постов страницы."""
+        if '_page' in self.__dict__:
+            return [(post.pk, post.updated_at) for post in self.object_list]
+        return self._keys[0]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._state()[2]
+
+    def has_previous(self):
+        return self._state()[1]
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(self.object_list[-1], FORWARD)
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(self.object_list[0], BACKWARD)
+        return None
+
+
+class CursorPaginator:
+    """Пагинация по ключу (pub_date, id) без OFFSET и COUNT(*).
+
+    Стоимость любой страницы равна стоимости первой: в запрос
+    попадает только условие на позицию последнего показанного поста.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def get_page(self, token=None):
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            return CursorPage(
+                self, self.object_list.order_by('-pub_date', '-pk'),
+                has_previous=False,
+            )
+        direction, pub_date, pk = cursor
+        if direction == FORWARD:
+            return CursorPage(
+                self,
+                self.object_list.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+                ).order_by('-pub_date', '-pk'),
+                has_previous=True,
+            )
+        return CursorPage(
+            self,
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk'),
+            has_previous=True,
+            backward=True,
+        )
+
+
+def page_keys(page):
+    """Пары (pk, updated_at) постов страницы одним запросом.
+
+    Запрос идёт по тому же окну, что и страница, но без
+    `select_related` и отложенных полей карточек: ETag ленты,
+    совпавший с клиентским, не оплачивает основной запрос view.
+    """
+    if isinstance(page, CursorPage):
+        return page.keys
+    return list(page.object_list.values_list('pk', 'updated_at'))
+
+
+def explain_rows(connection, queryset):
+    """Число строк, которое планировщик Postgres ждёт от queryset.
+
+    EXPLAIN выполняется напрямую: psycopg2 уже разбирает колонку
+    json в список, а `QuerySet.explain()` склеивает его в строку
+    через `str()`, которую нельзя прочитать как JSON.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset):
+    """Оценка числа строк по статистике СУБД для очень больших таблиц.
+
+    Вернёт None, если оценка недоступна или таблица достаточно мала,
+    чтобы посчитать строки честно.
+    """
+    threshold = settings.FEED_COUNT_ESTIMATE_THRESHOLD
+    connection = connections[queryset.db]
+    if threshold is None or connection.vendor != 'postgresql':
+        return None
+    try:
+        # Точка сохранения, чтобы ошибка не сорвала транзакцию запроса.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row is None or row[0] < threshold:
+                return None
+            return explain_rows(connection, queryset)
+    except (DatabaseError, LookupError, TypeError, ValueError):
+        # Оценка — только оптимизация: при любой ошибке считаем честно.
+        return None
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт число постов ленты из кэша.
+
+    Ключ `count_key` определяет ленту (вся лента, категория, автор);
+    кэш сбрасывается сигналами при изменении постов и категорий.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        key = feed_count_key(*self.count_key)
+        count = cache.get(key)
+        if count is None:
+            # Число ляжет в кэш надолго — считаем его на основной базе.
+            with use_primary():
+                count = estimate_count(self.object_list)
+                if count is None:
+                    count = super().count
+                timeout = feed_count_timeout(self.object_list)
+            cache.set(key, count, timeout)
+        return count
+
 
+def paginate(post_list, request, posts_to_display, count_key=None):
+    """Метод для пагинации страниц.
 
-def paginate(post_list, request, posts_to_display):
-    """Метод для пагинации страниц."""
+    Курсорный режим включается настройкой `CURSOR_PAGINATION`
+    или наличием параметра `?cursor=` в запросе. В обычном режиме
+    число постов ленты с ключом `count_key` берётся из кэша.
+    """
+    if 'cursor' in request.GET or settings.CURSOR_PAGINATION:
+        paginator = CursorPaginator(post_list, posts_to_display)
+        return paginator.get_page(request.GET.get('cursor'))
     page_number = request.GET.get('page', START_PAGE_NUM)
-    paginator = Paginator(post_list, posts_to_display)
+    paginator = CachedCountPaginator(post_list, posts_to_display, count_key)
     return paginator.get_page(page_number)
@@ -1,24 +1,130 @@
-from django.db.models import Count
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+# Посты, которые удаляются вместе с комментариями: их счётчик
+# обновлять незачем, иначе на каждый комментарий уйдёт UPDATE.
+# Вне `deleting_posts()` — None, и счётчики обновляются как обычно.
+_deleting_posts = ContextVar('deleting_posts', default=None)
+
+
+def published_q():
+    """Условие публикации поста вместе с его категорией.
+
+    Пост без категории (её удалили, FK — SET_NULL) остаётся
+    опубликованным; условие на LEFT JOIN обходится без `NOT IN`.
+    """
+    return Q(
+        Q(category__isnull=True) | Q(category__is_published=True),
+        is_published=True,
+        pub_date__lte=timezone.now(),
+    )
+
+
+@contextmanager
+def deleting_posts():
+    """Область удаления постов, в которой не обновляются их счётчики.
+
+    Сигнал pre_delete поста добавляет его сюда, а по выходе, в том
+    числе по исключению, набор сбрасывается: id поста, удаление
+    которого откатилось, не останется в нём до конца потока.
+    """
+    token = _deleting_posts.set(set(_deleting_posts.get() or ()))
+    try:
+        yield
+    finally:
+        _deleting_posts.reset(token)
+
+
+def mark_post_deleting(post_id):
+    """Отмечает пост удаляемым, если удаление идёт в `deleting_posts()`."""
+    deleting = _deleting_posts.get()
+    if deleting is not None:
+        deleting.add(post_id)
+
+
+def is_post_deleting(post_id):
+    """Удаляется ли пост в текущей `deleting_posts()`."""
+    return post_id in (_deleting_posts.get() or ())
+
 
-def publication_filters(queryset):
-    """Применяет дополнительные фильтры публикации к queryset."""
-    filters = {
-        'is_published': True,
-        'pub_date__lte': timezone.now()
-    }
+class PostQuerySet(models.QuerySet):
+    """Запросы к постам, из которых собираются ленты и страницы постов."""
 
-    queryset = queryset.filter(**filters)
-    return queryset
+    def published(self):
+        """Опубликованные посты из опубликованных категорий и без категории.
 
+        Категория проверяется условием на LEFT JOIN, а не подзапросом
+        `NOT IN`.
+        """
+        return self.filter(published_q())
 
-def annotation_and_selects(queryset):
-    """Применяет аннотации и select_related на queryset."""
-    return queryset.annotate(
-        comment_count=Count('comments')
-    ).order_by(
-        '-pub_date'
-    ).select_related(
-        'category', 'author', 'location'
+    def for_viewer(self, user):
+        """Посты, которые видит пользователь: опубликованные и свои."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(published_q() | Q(author=user))
+
+    def with_feed_related(self):
+        """Подгружает связанные объекты, которые показывает карточка."""
+        return self.select_related('category', 'author', 'location')
+
+    def with_comment_count(self):
+        """Гарантирует загрузку денормализованного счётчика комментариев.
+
+        Счётчик хранится в колонке, поэтому агрегация не нужна; метод
+        лишь снимает с неё отложенную загрузку после `.only()`/`.defer()`.
+        """
+        field_names, defer = self.query.deferred_loading
+        if defer and 'comment_count' in field_names:
+            return self.defer(None).defer(*field_names - {'comment_count'})
+        if not defer and field_names:
+            return self.only(*field_names, 'comment_count')
+        return self
+
+    def for_cards(self):
+        """Пресет для лент: без полного текста поста, новые сверху.
+
+        Карточка показывает сохранённое `excerpt`, поэтому `text`
+        не загружается.
+        """
+        return self.defer(
+            'text'
+        ).with_feed_related().with_comment_count().order_by('-pub_date')
+
+    def delete(self):
+        with deleting_posts():
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+def real_comment_count():
+    """Подзапрос с фактическим числом комментариев поста."""
+    from .models import Comment
+
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(
+                post=OuterRef('pk')
+            ).order_by().values('post').annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        0
     )
+
+
+def recount_comments(queryset):
+    """Исправляет расхождения счётчика комментариев одним UPDATE."""
+    drifted = queryset.annotate(
+        real_count=real_comment_count()
+    ).exclude(comment_count=F('real_count'))
+    return queryset.model.objects.filter(
+        pk__in=drifted.values('pk')
+    ).update(comment_count=real_comment_count())
@@ -0,0 +1,111 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from .caching import bump_version
+
+# Ширина копии в пикселях; высота считается по пропорциям оригинала.
+RENDITION_WIDTHS = {
+    'card': 640,
+    'detail': 1280,
+}
+RENDITION_FORMATS = {
+    'jpeg': ('JPEG', '.jpg', {'quality': 82, 'optimize': True,
+                              'progressive': True}),
+    'webp': ('WEBP', '.webp', {'quality': 80, 'method': 4}),
+}
+# Форматы, которые сохраняют прозрачность; для остальных она
+# заливается белым.
+ALPHA_FORMATS = {'WEBP'}
+
+
+def rendition_name(name, key, extension):
+    """Имя копии рядом с оригиналом: `posts/a.png` -> `posts/a_card.jpg`.
+
+    Хранилище берёт из него только каталог и расширение, а сам файл
+    называет по хэшу содержимого.
+    """
+    stem, _ = os.path.splitext(name)
+    return f'{stem}_{key}{extension}'
+
+
+def available_formats():
+    """Форматы копий, которые поддерживает установленный Pillow."""
+    return {
+        fmt: options for fmt, options in RENDITION_FORMATS.items()
+        if fmt != 'webp' or features.check('webp')
+    }
+
+
+def has_alpha(image):
+    """Есть ли в изображении прозрачность."""
+    return image.mode in ('RGBA', 'LA', 'PA') or (
+        'transparency' in image.info
+    )
+
+
+def on_white(image):
+    """Накладывает изображение RGBA на белый фон."""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def render(image, width, pil_format, options):
+    """Уменьшает изображение до ширины width и кодирует в pil_format."""
+    copy = image.copy()
+    copy.thumbnail((width, width * 10), Image.LANCZOS)
+    buffer = BytesIO()
+    copy.save(buffer, pil_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_renditions(post):
+    """Создаёт копии изображения поста и сохраняет их имена в посте."""
+    storage = post.image.storage
+    source = post.image.name
+    with storage.open(source) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image = image.convert('RGBA' if has_alpha(image) else 'RGB')
+    flat = on_white(image)
+    renditions = {'source': source}
+    for key, width in RENDITION_WIDTHS.items():
+        renditions[key] = {}
+        for fmt, (pil_format, extension, options) in (
+                available_formats().items()):
+            renditions[key][fmt] = storage.save(
+                rendition_name(source, key, extension),
+                render(
+                    image if pil_format in ALPHA_FORMATS else flat,
+                    width, pil_format, options
+                )
+            )
+    # Пост мог получить новое изображение, пока готовились копии.
+    # update() не шлёт сигналов, поэтому страницы сбрасываются здесь;
+    # ключ карточки уже содержит updated_at.
+    if type(post).objects.filter(pk=post.pk, image=source).update(
+            renditions=renditions, updated_at=timezone.now()):
+        bump_version('page')
+    return renditions
+
+
+def generate_renditions_for(post_id):
+    """Создаёт копии для поста по id, если у него есть изображение."""
+    from .models import Post
+
+    post = Post.objects.filter(pk=post_id).exclude(image='').first()
+    # Копии могла уже создать задача, поставленная раньше.
+    if post is not None and post.renditions.get('source') != post.image.name:
+        generate_renditions(post)
+
+
+def schedule_renditions(post):
+    """Ставит создание копий в очередь фоновых задач."""
+    from .tasks import generate_post_renditions
+
+    generate_post_renditions.delay_once(post.pk)
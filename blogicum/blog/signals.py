@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_version
+from .models import Category, Comment, Location, Post
+from .querysets import is_post_deleting, mark_post_deleting
+from .renditions import schedule_renditions
+
+User = get_user_model()
+
+
+def change_comment_count(post_id, delta):
+    """Атомарно изменяет счётчик комментариев и время изменения поста.
+
+    Комментарии показываются на странице поста, поэтому их изменение
+    сдвигает `updated_at`, по которому строятся ETag и Last-Modified.
+    """
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0),
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    change_comment_count(instance.post_id, 1 if created else 0)
+    bump_version('page')
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if not is_post_deleting(instance.post_id):
+        change_comment_count(instance.post_id, -1)
+    bump_version('page')
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    mark_post_deleting(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def feed_changed(sender, **kwargs):
+    bump_version('feed_count')
+    bump_version('page')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def post_card_related_changed(sender, **kwargs):
+    bump_version('post_card')
+    bump_version('page')
+
+
+@receiver(post_save, sender=User)
+def post_card_author_changed(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login — карточки не меняются.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_version('post_card')
+    bump_version('page')
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, **kwargs):
+    if instance.image and not instance.renditions:
+        schedule_renditions(instance)
@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+POST_IMAGE_DIR = 'posts'
+
+
+def content_hash(content):
+    """SHA-256 содержимого файла; позиция чтения возвращается в начало."""
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, которое называет файлы по хэшу их содержимого.
+
+    Одинаковые загрузки сохраняются один раз, а содержимое файла
+    по имени никогда не меняется, поэтому URL можно кэшировать навсегда.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = content_hash(content)
+        name = os.path.join(
+            os.path.dirname(name),
+            digest[:2],
+            digest + os.path.splitext(name)[1].lower(),
+        )
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length)
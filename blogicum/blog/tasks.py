@@ -0,0 +1,16 @@
+from core.tasks import task
+from .models import Post
+from .querysets import recount_comments
+from .renditions import generate_renditions_for
+
+
+@task()
+def generate_post_renditions(post_id):
+    """Создаёт уменьшенные копии изображения поста."""
+    generate_renditions_for(post_id)
+
+
+@task()
+def recount_post_comments():
+    """Исправляет расхождения счётчиков комментариев."""
+    recount_comments(Post.objects.all())
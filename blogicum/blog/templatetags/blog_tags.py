@@ -0,0 +1,22 @@
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.caching import may_cache, post_card_key
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка поста для лент, закэшированная целиком."""
+    cache = caches[settings.POST_CARD_CACHE]
+    key = post_card_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        if may_cache(post, 'post_card'):
+            cache.set(key, html)
+    return mark_safe(html)
@@ -0,0 +1,42 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку во временный файл небольшими кусками.
+
+    После `POST_IMAGE_MAX_SIZE` байт данные больше не сохраняются: файл
+    помечается как слишком большой, а форма отклоняет его по размеру,
+    не держа загрузку ни в памяти, ни целиком на диске.
+    """
+
+    chunk_size = 64 * 2 ** 10
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received <= settings.POST_IMAGE_MAX_SIZE:
+            self.file.write(raw_data)
+
+
+def limit_post_uploads(view):
+    """Подключает LimitedTemporaryFileUploadHandler только к этому view.
+
+    Лимит рассчитан на изображения постов, поэтому остальные загрузки
+    (например, в админке) идут через стандартные обработчики. Менять
+    их нужно до чтения `request.POST`, а его читает CsrfViewMiddleware,
+    поэтому CSRF проверяется уже после замены.
+    """
+    protected = csrf_protect(view)
+
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [LimitedTemporaryFileUploadHandler(request)]
+        return protected(request, *args, **kwargs)
+
+    return csrf_exempt(wraps(view)(wrapper))
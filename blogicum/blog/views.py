@@ -1,21 +1,103 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
-from django.db.models import Q
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic import DeleteView, UpdateView, ListView
-from django.utils import timezone
 
 from core.constants import POSTS_TO_DISPLAY
+from core.media import serve_media
 from .forms import CommentForm, PostForm, UserEditForm
 from .models import Post, Category
 from .mixins import PostFormMixin, CommentMixin
+from .caching import cache_anonymous_page
+from .etags import feed_etag, post_etag
 from .pagitane import paginate
-from .querysets import publication_filters, annotation_and_selects
+from .storage import POST_IMAGE_DIR
+from .uploads import limit_post_uploads
 
 
+def get_profile_posts(author, user):
+    """Посты автора, которые видит пользователь."""
+    return author.posts.for_viewer(user)
+
+
+def get_index_posts():
+    """Посты главной страницы."""
+    return Post.objects.published()
+
+
+def get_category_posts(slug):
+    """Посты категории."""
+    return Post.objects.published().filter(category__slug=slug)
+
+
+def get_detail_posts(request, post_id):
+    """Пост, если он опубликован или принадлежит пользователю."""
+    return Post.objects.for_viewer(request.user).filter(pk=post_id)
+
+
+def get_feed_page(request, post_list, count_key):
+    """Страница ленты, одна на запрос: её используют и ETag, и view."""
+    if not hasattr(request, '_feed_page'):
+        request._feed_page = paginate(
+            post_list.for_cards(), request, POSTS_TO_DISPLAY,
+            count_key=count_key
+        )
+    return request._feed_page
+
+
+def get_index_page(request):
+    return get_feed_page(request, get_index_posts(), ('index',))
+
+
+def get_category_page(request, slug):
+    return get_feed_page(
+        request, get_category_posts(slug), ('category', slug)
+    )
+
+
+def get_profile_page(request, author):
+    return get_feed_page(
+        request, get_profile_posts(author, request.user),
+        ('author', author.pk, author == request.user)
+    )
+
+
+def index_etag(request):
+    return feed_etag(request, get_index_page(request))
+
+
+def category_etag(request, slug):
+    return feed_etag(request, get_category_page(request, slug))
+
+
+def get_profile_author(request, username):
+    """Автор профиля, один на запрос: его используют и ETag, и view."""
+    if not hasattr(request, '_profile_author'):
+        request._profile_author = User.objects.filter(
+            username=username
+        ).first()
+    return request._profile_author
+
+
+def profile_etag(request, username):
+    author = get_profile_author(request, username)
+    if author is None:
+        return None
+    return feed_etag(request, get_profile_page(request, author))
+
+
+def detail_etag(request, post_id):
+    return post_etag(request, get_detail_posts(request, post_id))
+
+
+@method_decorator(condition(etag_func=profile_etag), name='get')
 class ProfileView(ListView):
     """Отображение страницы профиля."""
 
@@ -27,17 +109,21 @@ class ProfileView(ListView):
 
     def get_author(self):
         if not self.author:
-            self.author = get_object_or_404(
-                User, username=self.kwargs['username']
+            self.author = get_profile_author(
+                self.request, self.kwargs['username']
             )
+            if self.author is None:
+                raise Http404('Пользователь не найден.')
         return self.author
 
     def get_queryset(self):
-        author = self.get_author()
-        posts = author.posts.all()
-        if author != self.request.user:
-            posts = publication_filters(posts)
-        return annotation_and_selects(posts)
+        return get_profile_posts(
+            self.get_author(), self.request.user
+        ).for_cards()
+
+    def paginate_queryset(self, queryset, page_size):
+        page = get_profile_page(self.request, self.get_author())
+        return page.paginator, page, page.object_list, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -45,34 +131,29 @@ class ProfileView(ListView):
         return context
 
 
+@cache_anonymous_page(lambda: Post.objects.all())
+@condition(etag_func=index_etag)
 def index(request) -> HttpResponse:
     """Отображение главной страницы."""
     template = 'blog/index.html'
-    post_list = annotation_and_selects(publication_filters(Post.objects.all()))
-    unpublished_categories = Category.objects.filter(is_published=False)
-    post_list = post_list.exclude(category__in=unpublished_categories)
-
-    page_obj = paginate(post_list, request, POSTS_TO_DISPLAY)
     context = {
-        'page_obj': page_obj,
+        'page_obj': get_index_page(request),
     }
 
     return render(request, template, context)
 
 
+@cache_anonymous_page(lambda slug: Post.objects.filter(category__slug=slug))
+@condition(etag_func=category_etag)
 def category_detail(request, slug) -> HttpResponse:
     """Отображение страницы с информацией о категории."""
     template = 'blog/category.html'
     category = get_object_or_404(Category, slug=slug, is_published=True)
-    post_list = Post.objects.filter(category__slug=slug)
-    post_list = publication_filters(post_list)
-    post_list = annotation_and_selects(post_list)
-    posts = paginate(post_list, request, POSTS_TO_DISPLAY)
     comment_form = CommentForm()
 
     context = {
         'category': category,
-        'page_obj': posts,
+        'page_obj': get_category_page(request, slug),
         'comment_form': comment_form,
     }
 
@@ -80,18 +161,11 @@ def category_detail(request, slug) -> HttpResponse:
 
 
 @login_required
+@condition(etag_func=detail_etag)
 def post_detail(request, post_id) -> HttpResponse:
     """Отображение подробной информации о посте."""
     template = 'blog/detail.html'
-    queryset = Post.objects.filter(
-        Q(pk=post_id),
-        (Q(is_published=True, pub_date__lte=timezone.now())
-         | Q(author=request.user))
-    ).select_related(
-        'author',
-        'location',
-        'category'
-    )
+    queryset = get_detail_posts(request, post_id).with_feed_related()
     post = get_object_or_404(queryset)
 
     context = {
@@ -103,6 +177,7 @@ def post_detail(request, post_id) -> HttpResponse:
     return render(request, template, context)
 
 
+@limit_post_uploads
 @login_required
 def post_create(request):
     """Отображение страницы создания профиля."""
@@ -116,6 +191,7 @@ def post_create(request):
     return render(request, template_name, context={'form': form})
 
 
+@method_decorator(limit_post_uploads, name='dispatch')
 class EditPostView(PostFormMixin, LoginRequiredMixin, UpdateView):
     """Отображение страницы редактирования поста."""
 
@@ -128,11 +204,20 @@ class EditPostView(PostFormMixin, LoginRequiredMixin, UpdateView):
         )
 
 
-class DeletePostView(PostFormMixin, DeleteView):
-    """Отображение страницы удаления профиля."""
+class DeletePostView(LoginRequiredMixin, PostFormMixin, DeleteView):
+    """Отображение страницы удаления поста."""
 
     success_url = reverse_lazy('blog:index')
 
+    def get_queryset(self):
+        # Страница удаления показывает местоположение поста.
+        return super().get_queryset().select_related('location')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form'] = PostForm(instance=self.object)
+        return context
+
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     """Отображение страницы редактирования профиля."""
@@ -178,20 +263,13 @@ class CommentDeleteView(LoginRequiredMixin, CommentMixin, DeleteView):
     success_url = reverse_lazy('blog:index')
 
 
-class PostDeleteView(LoginRequiredMixin, DeleteView):
-    """Отображение страницы удаления поста."""
-
-    success_url = reverse_lazy('blog:index')
+@cache_control(
+    public=True, max_age=settings.MEDIA_IMMUTABLE_MAX_AGE, immutable=True
+)
+def post_image(request, path):
+    """Отдаёт изображение поста.
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
-            self.model, pk=kwargs.get(self.pk_url_kwarg)
-        )
-        if instance.author != request.user:
-            return redirect('blog:post_detail', post_id=instance.pk)
-        return super().dispatch(request, *args, **kwargs)
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['form'] = UserEditForm(instance=self.object)
-        return context
+    Имя файла — хэш его содержимого, поэтому браузер может хранить
+    ответ без перепроверки.
+    """
+    return serve_media(request, f'{POST_IMAGE_DIR}/{path}')
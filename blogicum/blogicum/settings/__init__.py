@@ -0,0 +1,21 @@
+"""Настройки проекта.
+
+Профиль выбирается переменной окружения BLOGICUM_ENV:
+`dev` (по умолчанию), `prod` или `bench`.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENVIRONMENT = os.environ.get('BLOGICUM_ENV', 'dev')
+
+if ENVIRONMENT == 'dev':
+    from .dev import *  # noqa: F401, F403
+elif ENVIRONMENT == 'prod':
+    from .prod import *  # noqa: F401, F403
+elif ENVIRONMENT == 'bench':
+    from .bench import *  # noqa: F401, F403
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль BLOGICUM_ENV={ENVIRONMENT!r}'
+    )
@@ -0,0 +1,247 @@
+"""Общие настройки всех профилей."""
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'your_secret_key_here'
+
+DEBUG = False
+
+ALLOWED_HOSTS = ["*"]
+
+INSTALLED_APPS = [
+    'core',
+    'pages',
+    'blog',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(BASE_DIR, 'templates')],  # Директория с шаблонами
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Компилировать шаблоны при старте WSGI/ASGI-процесса (см. core.warmup).
+TEMPLATES_WARMUP = False
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+# PostgreSQL включается переменной окружения POSTGRES_DB, иначе — SQLite.
+if os.environ.get('POSTGRES_DB'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ['POSTGRES_DB'],
+            'USER': os.environ.get('POSTGRES_USER', ''),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', ''),
+            'PORT': os.environ.get('POSTGRES_PORT', ''),
+            # За pgbouncer в режиме pool_mode=transaction именованные
+            # курсоры QuerySet.iterator() не переживают транзакцию.
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.environ.get('POSTGRES_PGBOUNCER') == '1'
+            ),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+
+# Реплики только для чтения: хосты PostgreSQL через запятую
+# в POSTGRES_REPLICA_HOSTS или, для проверки на своей машине,
+# файлы SQLite в SQLITE_REPLICAS. В тестах реплики смотрят
+# в тестовую основную базу.
+if os.environ.get('POSTGRES_DB'):
+    REPLICA_KEY, REPLICA_LOCATIONS = 'HOST', 'POSTGRES_REPLICA_HOSTS'
+else:
+    REPLICA_KEY, REPLICA_LOCATIONS = 'NAME', 'SQLITE_REPLICAS'
+for number, location in enumerate(
+        filter(None, os.environ.get(REPLICA_LOCATIONS, '').split(',')), 1):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        REPLICA_KEY: location,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи читать с основной базы (read-your-writes).
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_COOKIE = 'use_primary'
+
+# PRAGMA для каждого соединения с SQLite (см. core.signals).
+# WAL пускает читателей параллельно с записью, NORMAL в режиме WAL
+# не теряет целостность при сбое, cache_size < 0 задаётся в КиБ.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 2 ** 20,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-default',
+    },
+    'post_cards': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-post-cards',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-versions',
+    },
+}
+
+# Кэш, в котором хранятся отрендеренные карточки постов.
+POST_CARD_CACHE = 'post_cards'
+# Кэш версий групп ключей (см. blog.caching.get_version). Отдельный,
+# чтобы вытеснение карточек и страниц не сбрасывало версии.
+VERSION_CACHE = 'versions'
+
+# Сколько секунд хранить страницы лент для анонимных посетителей.
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static'),
+]
+STATIC_ROOT = BASE_DIR / 'static_collected'
+# Отдавать STATIC_ROOT из Django (core.staticfiles.serve_static).
+STATIC_SERVE = False
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+MEDIA_ROOT = BASE_DIR / 'media/'
+MEDIA_URL = '/media/'
+# Изображения постов названы по хэшу содержимого и никогда не меняются.
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+# Как отдавать MEDIA_URL: 'django' (FileResponse с Range),
+# 'x-accel-redirect' (nginx), 'x-sendfile' (Apache) или None,
+# если веб-сервер отдаёт MEDIA_ROOT сам и Django эти адреса не видит.
+MEDIA_SERVE_MODE = 'django'
+# internal-location nginx, который смотрит в MEDIA_ROOT.
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Изображения постов пишутся во временный файл кусками, а после этого
+# размера не сохраняются (см. blog.uploads.limit_post_uploads).
+POST_IMAGE_MAX_SIZE = 10 * 2 ** 20
+POST_IMAGE_MAX_PIXELS = 40_000_000
+
+# Очередь фоновых задач (manage.py run_worker).
+TASKS_CONCURRENCY = 2
+TASKS_MAX_ATTEMPTS = 3
+# Задержка перед повтором в секундах; удваивается с каждой попыткой.
+TASKS_RETRY_DELAY = 30
+TASKS_POLL_INTERVAL = 1
+TASKS_CLAIM_BATCH = 10
+# Через сколько секунд задача «зависшего» обработчика вернётся в очередь.
+TASKS_LOCK_TIMEOUT = 60 * 10
+# Чем отправлять письма из очереди, если EMAIL_BACKEND
+# равен 'core.mail.QueuedEmailBackend'.
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+LOGIN_URL = 'login'
+
+# Сколько SQL-запросов разрешено странице на GET и POST, включая
+# сессию и пользователя. Проверяется тестами (tests/test_query_budgets.py)
+# и QueryBudgetMiddleware в dev.
+QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:category_posts': 7,
+    'blog:post_detail': 5,
+    'blog:create_post': 7,
+    'blog:edit_post': 9,
+    'blog:delete_post': 6,
+    'blog:profile': 7,
+    'blog:edit_profile': 4,
+    'blog:add_comment': 5,
+    'blog:edit_comment': 5,
+    'blog:delete_comment': 5,
+    'pages:about': 2,
+    'pages:rules': 2,
+}
+
+# Курсорная пагинация лент вместо OFFSET/COUNT(*).
+CURSOR_PAGINATION = False
+
+# Сколько секунд хранить в кэше число постов ленты для пагинации.
+FEED_COUNT_TIMEOUT = 300
+# С какого размера таблицы постов считать их по статистике Postgres;
+# None — всегда считать честно.
+FEED_COUNT_ESTIMATE_THRESHOLD = 1_000_000
@@ -0,0 +1,13 @@
+"""Замеры производительности: как prod, но без внешних зависимостей.
+
+Статика не требует collectstatic, кэш — в памяти процесса.
+"""
+from . import base
+from .prod import *  # noqa: F401, F403
+
+CACHES = base.CACHES
+
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+STATIC_SERVE = False
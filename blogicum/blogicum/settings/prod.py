@@ -0,0 +1,81 @@
+"""Боевое окружение."""
+import os
+from pathlib import Path
+
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, DATABASES, TEMPLATES
+
+DEBUG = False
+
+# Соединение с базой переживает запрос, а не открывается заново.
+DATABASES = {
+    alias: {
+        **database,
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 60)),
+    }
+    for alias, database in DATABASES.items()
+}
+
+# Шаблоны читаются и компилируются один раз на процесс.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+TEMPLATES_WARMUP = True
+
+# Версии ключей кэша сбрасываются сигналами в одном процессе,
+# поэтому кэш должен быть общим для всех процессов приложения:
+# memcached, если он задан, иначе файловый кэш на этой машине.
+# Файловый кэш при переполнении удаляет случайную треть файлов,
+# поэтому у каждого псевдонима свой каталог и явный MAX_ENTRIES,
+# а версии лежат отдельно и до предела не дорастают.
+CACHE_DIR = Path(os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'cache'))
+
+
+def cache_backend(name):
+    if os.environ.get('MEMCACHED_LOCATION'):
+        return {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['MEMCACHED_LOCATION'].split(','),
+            'KEY_PREFIX': name,
+        }
+    return {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / name,
+    }
+
+
+CACHES = {
+    'default': {
+        **cache_backend('default'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    'post_cards': {
+        **cache_backend('post_cards'),
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    'versions': {
+        **cache_backend('versions'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+}
+
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStaticFilesStorage'
+STATIC_SERVE = True
@@ -1,11 +1,18 @@
+import re
+
 from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic import CreateView
 from django.conf.urls.static import static
 from django.contrib.auth import views
 
+from blog.storage import POST_IMAGE_DIR
+from blog.views import post_image
+from core.media import serve_media
+from core.staticfiles import serve_static
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls')),
@@ -26,14 +33,29 @@ urlpatterns = [
         name='password_change'
     ),
 ]
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.MEDIA_SERVE_MODE:
+    media_prefix = settings.MEDIA_URL.lstrip('/')
+    urlpatterns += [
+        re_path(
+            rf'^{re.escape(media_prefix)}{POST_IMAGE_DIR}/(?P<path>.*)$',
+            post_image,
+        ),
+        re_path(rf'^{re.escape(media_prefix)}(?P<path>.*)$', serve_media),
+    ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+if settings.STATIC_SERVE:
+    urlpatterns += [
+        re_path(
+            rf'^{re.escape(settings.STATIC_URL.lstrip("/"))}(?P<path>.*)$',
+            serve_static,
+        ),
+    ]
 
 handler403 = 'pages.views.csrf_failure'
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
 
     urlpatterns += (
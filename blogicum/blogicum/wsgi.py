@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+# Импорт после настройки Django: модули проекта могут читать settings
+# и модели при импорте.
+from core.warmup import warm_up  # noqa: E402
+
+warm_up()
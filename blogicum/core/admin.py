@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Административная панель для очереди фоновых задач."""
+
+    list_display = (
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'created_at'
+    )
+    list_filter = ('status', 'name')
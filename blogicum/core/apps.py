@@ -6,3 +6,10 @@ class CoreConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        from . import signals  # noqa: F401
+
+        autodiscover_modules('tasks')
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+
+POST_TEXT = 'Текст поста для замера скорости ответа. ' * 20
+
+
+@contextmanager
+def bench_database(name=None):
+    """Временная база с применёнными миграциями, как в тестах.
+
+    Без name база создаётся в памяти (для SQLite), иначе — в файле name.
+    """
+    test_settings = connection.settings_dict['TEST']
+    previous_name = test_settings['NAME']
+    if name is not None:
+        test_settings['NAME'] = name
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = previous_name
+
+
+def seed(posts):
+    """Автор, категория и posts опубликованных постов."""
+    author = get_user_model().objects.create_user('bench')
+    category = Category.objects.create(
+        title='Замеры', description='Категория для замеров', slug='bench'
+    )
+    location = Location.objects.create(name='Планета Земля')
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {number}',
+            text=POST_TEXT,
+            excerpt=Post.make_excerpt(POST_TEXT),
+            pub_date=now - timedelta(minutes=number),
+            author=author,
+            category=category,
+            location=location,
+        )
+        for number in range(posts)
+    )
+    return author
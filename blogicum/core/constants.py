@@ -1,4 +1,7 @@
+EXPORT_CHUNK_SIZE: int = 2000
 MAX_CHARACTERS: int = 256
 MAX_TITLE_LENGTH: int = 15
 POSTS_TO_DISPLAY: int = 10
+POST_EXCERPT_LENGTH: int = 512
+POST_EXCERPT_WORDS: int = 10
 START_PAGE_NUM: int = 1
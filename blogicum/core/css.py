@@ -0,0 +1,179 @@
+import re
+from pathlib import Path
+
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+CLASS_ATTR_RE = re.compile(r'''class\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+TEMPLATE_TAG_RE = re.compile(r'{%.*?%}|{{.*?}}', re.S)
+NOT_RE = re.compile(r':not\([^)]*\)')
+SELECTOR_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+KEYFRAMES_RE = re.compile(r'^@(?:-webkit-)?keyframes\s+(\S+)')
+NESTED_AT_RULES = ('@media', '@supports')
+
+# Классы, которых нет ни в шаблонах, ни в выводе тегов django-bootstrap5
+# для образцовой формы (см. команду build_css): алерты, группы полей
+# и состояния, которые включает JavaScript Bootstrap.
+SAFELIST = frozenset({
+    'alert', 'alert-danger', 'alert-dismissible', 'btn-close', 'fade',
+    'show', 'form-check-inline', 'has-validation', 'input-group',
+    'input-group-text', 'was-validated', 'col-form-label',
+    'visually-hidden', 'row', 'mt-1', 'col-auto', 'btn-check', 'disabled',
+})
+
+
+def html_classes(text):
+    """CSS-классы из атрибутов class в HTML или тексте шаблона.
+
+    Теги `{% %}` и `{{ }}` вырезаются, а слова между ними (например,
+    `active` в `{% if %}active{% endif %}`) считаются классами.
+    """
+    classes = set()
+    for double, single in CLASS_ATTR_RE.findall(text):
+        value = TEMPLATE_TAG_RE.sub(' ', double or single)
+        classes.update(value.split())
+    return classes
+
+
+def template_classes(paths):
+    """CSS-классы из атрибутов class в шаблонах."""
+    classes = set()
+    for path in paths:
+        classes |= html_classes(Path(path).read_text(encoding='utf-8'))
+    return classes
+
+
+def defined_classes(css):
+    """Классы, которые упоминаются в селекторах правил CSS."""
+    classes = set()
+    for prelude, _ in _rules(parse(css)):
+        classes.update(SELECTOR_CLASS_RE.findall(prelude))
+    return classes
+
+
+def _rules(blocks):
+    for prelude, body in blocks:
+        if isinstance(body, list):
+            yield from _rules(body)
+        elif body is not None and not prelude.startswith('@'):
+            yield prelude, body
+
+
+def block_end(css, pos):
+    """Позиция `}`, закрывающей блок, который начинается с pos."""
+    depth = 1
+    while pos < len(css):
+        char = css[pos]
+        if char in '"\'':
+            pos = css.index(char, pos + 1)
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if not depth:
+                return pos
+        pos += 1
+    raise ValueError('Незакрытый блок CSS')
+
+
+def _parse(css, pos):
+    blocks = []
+    start = pos
+    while pos < len(css):
+        char = css[pos]
+        if char in '"\'':
+            pos = css.index(char, pos + 1) + 1
+            continue
+        if char == '}':
+            return blocks, pos
+        if char == ';':
+            blocks.append((css[start:pos + 1].strip(), None))
+        elif char == '{':
+            prelude = css[start:pos].strip()
+            if prelude.startswith(NESTED_AT_RULES):
+                children, pos = _parse(css, pos + 1)
+                blocks.append((prelude, children))
+            else:
+                end = block_end(css, pos + 1)
+                blocks.append((prelude, css[pos + 1:end]))
+                pos = end
+        else:
+            pos += 1
+            continue
+        pos += 1
+        start = pos
+    return blocks, pos
+
+
+def parse(css):
+    """Разбирает CSS на блоки `(prelude, body)`.
+
+    body — строка объявлений, список вложенных блоков для
+    @media/@supports или None для инструкций вроде `@charset`.
+    """
+    return _parse(COMMENT_RE.sub('', css), 0)[0]
+
+
+def serialize(blocks):
+    parts = []
+    for prelude, body in blocks:
+        if body is None:
+            parts.append(prelude)
+        elif isinstance(body, list):
+            parts.append(f'{prelude}{{{serialize(body)}}}')
+        else:
+            parts.append(f'{prelude}{{{body}}}')
+    return ''.join(parts)
+
+
+def split_selectors(prelude):
+    """Делит список селекторов по запятым вне скобок."""
+    selectors, depth, start = [], 0, 0
+    for pos, char in enumerate(prelude):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and not depth:
+            selectors.append(prelude[start:pos])
+            start = pos + 1
+    selectors.append(prelude[start:])
+    return selectors
+
+
+def selector_is_used(selector, used):
+    # Класс внутри :not() не обязателен для совпадения селектора.
+    return set(SELECTOR_CLASS_RE.findall(NOT_RE.sub('', selector))) <= used
+
+
+def _purge(blocks, used):
+    kept = []
+    for prelude, body in blocks:
+        if isinstance(body, list):
+            children = _purge(body, used)
+            if children:
+                kept.append((prelude, children))
+        elif body is None or prelude.startswith('@'):
+            kept.append((prelude, body))
+        else:
+            selectors = [
+                selector for selector in split_selectors(prelude)
+                if selector_is_used(selector, used)
+            ]
+            if selectors:
+                kept.append((','.join(selectors), body))
+    return kept
+
+
+def purge(css, used):
+    """Оставляет в CSS только правила, применимые к классам used.
+
+    Правила без классов (сброс стилей, `:root`) сохраняются,
+    анимации — только если на них ссылается оставшийся CSS.
+    """
+    kept = _purge(parse(css), used)
+    keyframes = [block for block in kept if KEYFRAMES_RE.match(block[0])]
+    rules = [block for block in kept if not KEYFRAMES_RE.match(block[0])]
+    text = serialize(rules)
+    return serialize(rules + [
+        block for block in keyframes
+        if KEYFRAMES_RE.match(block[0]).group(1) in text
+    ])
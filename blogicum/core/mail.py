@@ -0,0 +1,61 @@
+from base64 import b64encode
+from email.mime.base import MIMEBase
+
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import send_email
+
+
+def serialize_attachment(attachment):
+    """Вложение `(filename, content, mimetype)` в виде, пригодном для JSON.
+
+    Готовые MIMEBase-части в очередь не передать — для них ValueError.
+    """
+    if isinstance(attachment, MIMEBase):
+        raise ValueError(
+            'QueuedEmailBackend не поддерживает вложения MIMEBase,'
+            ' используйте EmailMessage.attach(filename, content, mimetype).'
+        )
+    filename, content, mimetype = attachment
+    serialized = {'filename': filename, 'mimetype': mimetype}
+    if isinstance(content, str):
+        serialized['content'] = content
+    else:
+        serialized['base64'] = b64encode(content).decode('ascii')
+    return serialized
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который отправляет письма из очереди задач.
+
+    Письмо ставится в очередь, а `run_worker` отправляет его через
+    бэкенд из настройки `TASKS_EMAIL_BACKEND`.
+    """
+
+    def send_messages(self, email_messages):
+        sent = 0
+        for message in email_messages:
+            try:
+                attachments = [
+                    serialize_attachment(attachment)
+                    for attachment in message.attachments
+                ]
+            except ValueError:
+                if self.fail_silently:
+                    continue
+                raise
+            send_email.delay({
+                'subject': message.subject,
+                'body': message.body,
+                'from_email': message.from_email,
+                'to': message.to,
+                'cc': message.cc,
+                'bcc': message.bcc,
+                'reply_to': message.reply_to,
+                'headers': message.extra_headers,
+                'alternatives': getattr(message, 'alternatives', []),
+                'attachments': attachments,
+                'content_subtype': message.content_subtype,
+            })
+            sent += 1
+        return sent
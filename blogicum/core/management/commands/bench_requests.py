@@ -0,0 +1,106 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from blog.models import Post
+from core.bench import bench_database, seed
+
+# Профили, которые сравнивает --compare.
+PROFILES = ('dev', 'bench')
+
+
+def measure(client, url, requests):
+    """Медиана и 95-й перцентиль времени ответа на url в миллисекундах."""
+    client.get(url)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != HTTPStatus.OK:
+            raise CommandError(f'{url}: статус {response.status_code}')
+    timings.sort()
+    return {
+        'median': statistics.median(timings),
+        'p95': timings[max(int(len(timings) * 0.95) - 1, 0)],
+    }
+
+
+def run_benchmark(requests, posts):
+    """Замеряет основные страницы от имени вошедшего пользователя."""
+    author = seed(posts)
+    client = Client()
+    client.force_login(author)
+    post = Post.objects.first()
+    urls = (
+        '/',
+        '/category/bench/',
+        f'/profile/{author.username}/',
+        f'/posts/{post.pk}/',
+    )
+    return {url: measure(client, url, requests) for url in urls}
+
+
+class Command(BaseCommand):
+    """Замер времени ответа страниц в текущем профиле настроек."""
+
+    help = (
+        'Замеряет время ответа основных страниц на временной базе.'
+        ' С --compare сравнивает профили BLOGICUM_ENV.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100)
+        parser.add_argument(
+            '--compare', action='store_true',
+            help=f'Запустить замер в профилях {", ".join(PROFILES)}.'
+        )
+        parser.add_argument(
+            '--json', action='store_true', help='Вывести результат в JSON.'
+        )
+
+    def handle(self, *args, requests, posts, compare, **options):
+        if compare:
+            return self.compare(requests, posts)
+        with bench_database():
+            results = run_benchmark(requests, posts)
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+        for url, result in results.items():
+            self.stdout.write(
+                f'{url:<30} медиана {result["median"]:7.2f} мс'
+                f'  p95 {result["p95"]:7.2f} мс'
+            )
+
+    def compare(self, requests, posts):
+        results = {}
+        for profile in PROFILES:
+            output = subprocess.run(
+                [
+                    sys.executable, settings.BASE_DIR / 'manage.py',
+                    'bench_requests', '--json',
+                    '--requests', str(requests), '--posts', str(posts),
+                ],
+                env={**os.environ, 'BLOGICUM_ENV': profile},
+                capture_output=True, check=True, text=True,
+            ).stdout
+            results[profile] = json.loads(output)
+        self.stdout.write(
+            f'{"медиана, мс":<30}'
+            + ''.join(f'{profile:>10}' for profile in PROFILES)
+        )
+        for url in results[PROFILES[0]]:
+            self.stdout.write(f'{url:<30}' + ''.join(
+                f'{results[profile][url]["median"]:10.2f}'
+                for profile in PROFILES
+            ))
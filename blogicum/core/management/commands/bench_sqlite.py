@@ -0,0 +1,104 @@
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client, override_settings
+
+from blog.models import Post
+from core.bench import bench_database, seed
+
+
+def worker(user, action, stop, counts, lock):
+    """Повторяет action, пока не выставлен stop, и считает исходы."""
+    client = Client()
+    client.force_login(user)
+    done = Counter()
+    try:
+        while not stop.is_set():
+            try:
+                action(client)
+                done['ok'] += 1
+            except OperationalError:
+                done['errors'] += 1
+    finally:
+        connections.close_all()
+        with lock:
+            counts.update(done)
+
+
+def run_load(path, seconds, readers, writers):
+    """Читатели ленты и авторы комментариев работают параллельно."""
+    with bench_database(path):
+        author = seed(100)
+        post = Post.objects.first()
+        stop = threading.Event()
+        lock = threading.Lock()
+        reads, writes = Counter(), Counter()
+
+        def read(client):
+            client.get('/')
+
+        def write(client):
+            client.post(
+                f'/posts/{post.pk}/comment/', {'text': 'Комментарий'}
+            )
+
+        threads = [
+            threading.Thread(
+                target=worker, args=(author, read, stop, reads, lock)
+            )
+            for _ in range(readers)
+        ] + [
+            threading.Thread(
+                target=worker, args=(author, write, stop, writes, lock)
+            )
+            for _ in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return reads, writes
+
+
+class Command(BaseCommand):
+    """Замер пропускной способности SQLite при параллельных чтении и записи."""
+
+    help = (
+        'Сравнивает SQLite без настроек и с SQLITE_PRAGMAS под нагрузкой:'
+        ' читатели открывают ленту, писатели добавляют комментарии.'
+        ' Запускать с BLOGICUM_ENV=bench.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+
+    def handle(self, *args, seconds, readers, writers, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер рассчитан на SQLite.')
+        modes = {
+            'по умолчанию': {},
+            'SQLITE_PRAGMAS': settings.SQLITE_PRAGMAS,
+        }
+        for title, pragmas in modes.items():
+            with tempfile.TemporaryDirectory() as directory, \
+                    override_settings(SQLITE_PRAGMAS=pragmas):
+                reads, writes = run_load(
+                    Path(directory) / 'bench.sqlite3',
+                    seconds, readers, writers
+                )
+            self.stdout.write(
+                f'{title:<16}'
+                f' чтений/с {reads["ok"] / seconds:8.1f}'
+                f'  записей/с {writes["ok"] / seconds:8.1f}'
+                f'  ошибок {reads["errors"] + writes["errors"]}'
+            )
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+from django import forms
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+
+from core.css import SAFELIST, html_classes, purge, template_classes
+
+SOURCE = 'static/css/bootstrap.min.css'
+BUNDLE = 'static/css/blogicum.min.css'
+CRITICAL = 'templates/includes/critical_css.html'
+# Шаблоны, из которых состоит первый экран любой страницы.
+CRITICAL_TEMPLATES = ('base.html', 'includes/header.html')
+# Теги django-bootstrap5, которыми шаблоны выводят формы и кнопки.
+BOOTSTRAP_TAGS = Template(
+    '{% load django_bootstrap5 %}{% bootstrap_form form %}'
+    '{% bootstrap_button button_type="submit" content="Отправить" %}'
+)
+
+
+class SampleForm(forms.Form):
+    """Поля всех видов, которые формы сайта выводят через bootstrap_form."""
+
+    text = forms.CharField(help_text='Подсказка')
+    textarea = forms.CharField(widget=forms.Textarea)
+    email = forms.EmailField()
+    password = forms.CharField(widget=forms.PasswordInput)
+    date = forms.DateTimeField(
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'})
+    )
+    choice = forms.ChoiceField(choices=[('1', '1')])
+    flag = forms.BooleanField()
+    image = forms.ImageField(required=False)
+
+    def clean(self):
+        raise forms.ValidationError('Ошибка формы')
+
+
+def rendered_classes():
+    """Классы из HTML, который теги django-bootstrap5 собирают в Python.
+
+    Форма выводится пустой, с ошибками и частично заполненной, чтобы
+    попали и классы состояний проверки.
+    """
+    classes = set()
+    for data in (None, {}, {'text': 'текст'}):
+        html = BOOTSTRAP_TAGS.render(Context({'form': SampleForm(data)}))
+        classes |= html_classes(html)
+    return classes
+
+
+class Command(BaseCommand):
+    """Собирает урезанный Bootstrap и критический CSS для base.html."""
+
+    help = (
+        'Оставляет в Bootstrap только классы из шаблонов и встраивает'
+        ' стили первого экрана в base.html.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', type=Path, default=settings.BASE_DIR / SOURCE,
+            help='Полный Bootstrap.'
+        )
+        parser.add_argument(
+            '--output', type=Path, default=settings.BASE_DIR / BUNDLE,
+            help='Куда записать урезанный CSS.'
+        )
+        parser.add_argument(
+            '--critical', type=Path, default=settings.BASE_DIR / CRITICAL,
+            help='Куда записать шаблон со встроенным критическим CSS.'
+        )
+
+    def handle(self, *args, source, output, critical, **options):
+        templates_dir = Path(settings.TEMPLATES_DIR)
+        css = source.read_text(encoding='utf-8')
+
+        used = (
+            template_classes(templates_dir.rglob('*.html'))
+            | rendered_classes() | SAFELIST
+        )
+        bundle = purge(css, used)
+        output.write_text(bundle, encoding='utf-8')
+
+        above_the_fold = template_classes(
+            templates_dir / name for name in CRITICAL_TEMPLATES
+        )
+        critical.write_text(
+            '{% verbatim %}<style>'
+            f'{purge(css, above_the_fold)}'
+            '</style>{% endverbatim %}\n',
+            encoding='utf-8',
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{source.name}: {len(css)} байт -> {output.name}:'
+            f' {len(bundle)} байт, критический CSS:'
+            f' {critical.stat().st_size} байт'
+        ))
@@ -0,0 +1,110 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, close_old_connections, connection
+
+from core.routers import use_primary
+from core.tasks import claim_task, release_stale_tasks, run_task
+
+logger = logging.getLogger(__name__)
+
+# Предельная пауза после ошибок базы данных подряд, в секундах.
+MAX_ERROR_BACKOFF = 60
+
+
+class Command(BaseCommand):
+    """Обработчик очереди фоновых задач."""
+
+    help = 'Выполняет задачи из очереди core.Task.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.TASKS_CONCURRENCY,
+            help='Сколько задач выполнять одновременно.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить накопившиеся задачи и завершиться.'
+        )
+
+    def handle(self, *args, concurrency, once, **options):
+        self.stop = threading.Event()
+        self.crashed = threading.Event()
+        release_stale_tasks()
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(f'{socket.gethostname()}:{os.getpid()}:{number}', once),
+                daemon=True,
+            )
+            for number in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(settings.TASKS_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+        if self.crashed.is_set():
+            raise CommandError('Обработчик задач упал, подробности в журнале.')
+
+    def work(self, worker, once):
+        try:
+            # Задачи читают то, что только что записали, — реплики не годятся.
+            with use_primary():
+                self.process(worker, once)
+        except Exception:
+            logger.exception('Обработчик %s остановлен ошибкой', worker)
+            self.crashed.set()
+            self.stop.set()
+
+    def process(self, worker, once):
+        errors = 0
+        released_at = time.monotonic()
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    if (time.monotonic() - released_at
+                            > settings.TASKS_LOCK_TIMEOUT):
+                        release_stale_tasks()
+                        released_at = time.monotonic()
+                    done = self.step(worker)
+                except DatabaseError:
+                    # Например, «database is locked» в SQLite. Задача,
+                    # которую не удалось сохранить, вернётся в очередь
+                    # через release_stale_tasks.
+                    errors += 1
+                    logger.exception('Ошибка базы данных в %s', worker)
+                    connection.close()
+                    self.stop.wait(min(
+                        settings.TASKS_POLL_INTERVAL * 2 ** errors,
+                        MAX_ERROR_BACKOFF,
+                    ))
+                    continue
+                errors = 0
+                if done:
+                    continue
+                if once:
+                    return
+                self.stop.wait(settings.TASKS_POLL_INTERVAL)
+        finally:
+            connection.close()
+
+    def step(self, worker):
+        """Выполняет одну задачу; False, если очередь пуста."""
+        task = claim_task(worker)
+        if task is None:
+            return False
+        task = run_task(task)
+        self.stdout.write(f'{worker}: {task}')
+        return True
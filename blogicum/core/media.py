@@ -0,0 +1,154 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import (
+    ImproperlyConfigured, SuspiciousFileOperation
+)
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """Файл, из которого читается не больше length байт с позиции start.
+
+    `fileno()` намеренно нет: `wsgi.file_wrapper`, увидев его, может
+    отдать через `sendfile` весь остаток файла, а не диапазон. Без него
+    любой сервер читает кусок через `read()`, а целые файлы по-прежнему
+    уходят через `sendfile`.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Границы (start, end) единственного диапазона из заголовка Range.
+
+    Вернёт None, если заголовок не поддерживается — тогда отдаётся
+    весь файл; ValueError, если диапазон лежит за концом файла.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        if int(last) == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def range_is_fresh(request, etag, last_modified):
+    """Проверка If-Range: диапазон отдаётся, только если файл не менялся."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def guess_content_type(full_path):
+    return mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+
+def file_response(request, full_path, size, etag, last_modified):
+    """Отдаёт файл целиком или запрошенный диапазон через FileResponse."""
+    content_type = guess_content_type(full_path)
+    header = request.META.get('HTTP_RANGE')
+    byte_range = None
+    if header and range_is_fresh(request, etag, last_modified):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+    start, end = byte_range
+    response = FileResponse(
+        FileRange(file, start, end - start + 1),
+        status=206,
+        content_type=content_type,
+    )
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def offload_response(header, value, full_path):
+    """Пустой ответ, тело которого отдаст веб-сервер перед Django."""
+    response = HttpResponse(content_type=guess_content_type(full_path))
+    response[header] = value
+    return response
+
+
+def serve_media(request, path):
+    """Отдаёт файл из MEDIA_ROOT, не читая его в память.
+
+    Режим задаётся настройкой `MEDIA_SERVE_MODE`:
+    `django` — FileResponse с поддержкой Range;
+    `x-accel-redirect` — передать отдачу nginx (internal-location
+    `MEDIA_ACCEL_REDIRECT_PREFIX`); `x-sendfile` — Apache/lighttpd.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    stat = os.stat(full_path)
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        mode = settings.MEDIA_SERVE_MODE
+        if mode == 'django':
+            response = file_response(
+                request, full_path, stat.st_size, etag, last_modified
+            )
+        elif mode == 'x-accel-redirect':
+            response = offload_response(
+                'X-Accel-Redirect',
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path),
+                full_path,
+            )
+        elif mode == 'x-sendfile':
+            response = offload_response('X-Sendfile', full_path, full_path)
+        else:
+            raise ImproperlyConfigured(
+                f'Неизвестный MEDIA_SERVE_MODE: {mode!r}'
+            )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,54 @@
+from django.conf import settings
+
+from .query_budget import QueryLog, check_budget
+from .routers import use_primary
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ReplicaStickinessMiddleware:
+    """Read-your-writes поверх ReplicaRouter.
+
+    Запросы на запись целиком работают с основной базой и ставят
+    cookie на REPLICA_STICKY_SECONDS; пока она жива, чтения этого
+    пользователя тоже идут на основную базу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        writes = request.method not in SAFE_METHODS
+        pinned = writes or settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        with use_primary(pinned):
+            response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class QueryBudgetMiddleware:
+    """В режиме DEBUG проверяет число SQL-запросов страницы.
+
+    Бюджеты маршрутов задаются в QUERY_BUDGETS; превышение
+    показывается страницей ошибки со списком повторяющихся запросов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DEBUG:
+            return self.get_response(request)
+        with QueryLog() as log:
+            response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            check_budget(match.view_name, log.queries)
+        return response
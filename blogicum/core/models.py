@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+from core.constants import MAX_CHARACTERS
 
 
 class PublishedModel(models.Model):
@@ -17,3 +20,83 @@ class PublishedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Task(models.Model):
+    """Фоновая задача в очереди, которую выполняет `run_worker`."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=MAX_CHARACTERS,
+        verbose_name='Задача'
+    )
+    args = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Аргументы'
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Именованные аргументы'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name='Максимум попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Запустить после'
+    )
+    locked_by = models.CharField(
+        max_length=MAX_CHARACTERS,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начата'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        indexes = [
+            models.Index(
+                fields=['run_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='task_pending_idx',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.get_status_display()})'
@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# Служебные запросы соединения и транзакций в бюджет не входят:
+# PRAGMA из core.signals выполняются при каждом новом соединении.
+IGNORED_SQL_PREFIXES = (
+    'PRAGMA', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT',
+)
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PLACEHOLDERS_RE = re.compile(r'%s(?:, %s)+')
+
+
+class QueryBudgetExceeded(Exception):
+    """Страница выполнила больше SQL-запросов, чем разрешает бюджет."""
+
+
+class QueryLog:
+    """Собирает SQL всех баз данных, пока открыт контекст.
+
+    Запросы перехватываются через `execute_wrapper`, поэтому
+    DEBUG не нужен и соединения с неиспользуемыми базами не открываются.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(IGNORED_SQL_PREFIXES):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(
+                connections[alias].execute_wrapper(self)
+            )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stack.close()
+
+    def __len__(self):
+        return len(self.queries)
+
+
+def get_budget(view_name):
+    """Сколько запросов разрешено маршруту; None — бюджет не задан."""
+    return settings.QUERY_BUDGETS.get(view_name)
+
+
+def normalize_sql(sql):
+    """SQL без значений: так повторы с разными id видны как один запрос."""
+    return PLACEHOLDERS_RE.sub('%s', LITERAL_RE.sub('%s', sql))
+
+
+def duplicate_queries(queries):
+    """Пары (SQL, сколько раз выполнен) для запросов, повторённых дважды."""
+    counts = Counter(normalize_sql(sql) for sql in queries)
+    return [(sql, count) for sql, count in counts.most_common() if count > 1]
+
+
+def budget_report(view_name, queries, budget):
+    lines = [
+        f'{view_name}: {len(queries)} SQL-запросов при бюджете {budget}.'
+    ]
+    duplicates = duplicate_queries(queries)
+    if duplicates:
+        lines.append('Повторяющиеся запросы:')
+        lines.extend(f'  {count} × {sql}' for sql, count in duplicates)
+    else:
+        lines.append('Повторов нет, все запросы:')
+        lines.extend(f'  {sql}' for sql in queries)
+    return '\n'.join(lines)
+
+
+def check_budget(view_name, queries):
+    """Бросает QueryBudgetExceeded, если queries не укладываются в бюджет.
+
+    Маршруты без бюджета не проверяются.
+    """
+    budget = get_budget(view_name)
+    if budget is not None and len(queries) > budget:
+        raise QueryBudgetExceeded(budget_report(view_name, queries, budget))
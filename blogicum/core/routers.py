@@ -0,0 +1,48 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# Читать с основной базы в текущем запросе (или задаче).
+_use_primary = ContextVar('use_primary', default=False)
+
+
+@contextmanager
+def use_primary(pinned=True):
+    """Направляет чтения внутри блока на основную базу."""
+    token = _use_primary.set(pinned)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+def reads_from_replicas():
+    """Могут ли чтения в текущем контексте уйти на реплику."""
+    return bool(settings.DATABASE_REPLICAS) and not _use_primary.get()
+
+
+class ReplicaRouter:
+    """Чтения — на случайную реплику, запись — на основную базу.
+
+    Внутри `use_primary()` чтения тоже идут на основную базу:
+    так запросы на запись и запросы сразу после записи видят
+    собственные изменения, даже если реплика отстаёт.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not reads_from_replicas():
+            return PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -0,0 +1,142 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, staticfiles_storage
+)
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+
+from .media import guess_content_type
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Расширения текстовых файлов, которые имеет смысл сжимать заранее.
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.json', '.txt', '.xml', '.html',
+)
+# Сжатая копия сохраняется, только если она меньше этой доли оригинала.
+MAX_COMPRESSED_RATIO = 0.95
+
+
+def compressors():
+    """Пары (Content-Encoding, суффикс, функция), от лучшего к худшему."""
+    available = []
+    if brotli is not None:
+        available.append(('br', '.br', brotli.compress))
+    available.append(
+        ('gzip', '.gz', lambda data: gzip.compress(data, 9, mtime=0))
+    )
+    return available
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэшированные имена статики плюс заранее сжатые копии.
+
+    При `collectstatic` рядом с каждым текстовым файлом пишутся
+    `.br` (если установлен пакет Brotli) и `.gz`, чтобы при отдаче
+    не тратить время на сжатие.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            yield name, hashed_name, processed
+            if not isinstance(processed, Exception):
+                processed_names.add(name)
+        if dry_run:
+            return
+        for name in processed_names:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+                self.compress(self.stored_name(name))
+
+    def compress(self, name):
+        with self.open(name) as file:
+            data = file.read()
+        for _, suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) > len(data) * MAX_COMPRESSED_RATIO:
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+
+def accepted_encodings(request):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых `q=0`."""
+    encodings = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = item.partition(';')
+        name, _, quality = params.partition('=')
+        try:
+            if name.strip() == 'q' and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(coding.strip().lower())
+    return encodings
+
+
+def is_hashed(path):
+    """Есть ли в имени хэш содержимого, то есть неизменен ли файл."""
+    return path in getattr(staticfiles_storage, 'hashed_files', {}).values()
+
+
+def serve_static(request, path):
+    """Отдаёт собранную статику из STATIC_ROOT.
+
+    Выбирает заранее сжатую копию по Accept-Encoding; файлы
+    с хэшем в имени кэшируются браузером без перепроверки,
+    остальные перепроверяются по ETag и Last-Modified.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    accepted = accepted_encodings(request)
+    served_path, encoding = full_path, None
+    for coding, suffix, _ in compressors():
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            served_path, encoding = full_path + suffix, coding
+            break
+    # Валидаторы берутся у отдаваемого файла: у каждой сжатой копии
+    # свой размер, а значит, и свой ETag.
+    stat = os.stat(served_path)
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = FileResponse(
+            open(served_path, 'rb'),
+            content_type=guess_content_type(full_path),
+            filename=os.path.basename(full_path),
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if is_hashed(path):
+        patch_cache_control(
+            response, public=True, immutable=True,
+            max_age=settings.STATIC_IMMUTABLE_MAX_AGE,
+        )
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
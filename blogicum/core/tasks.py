@@ -0,0 +1,136 @@
+import logging
+import traceback
+from base64 import b64decode
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name=None, max_attempts=None):
+    """Регистрирует функцию как фоновую задачу.
+
+    У функции появляется метод `delay(*args, **kwargs)`, который ставит
+    вызов в очередь, и `delay_once(...)`, который не ставит вызов,
+    если такой же уже ждёт в очереди. Аргументы должны сериализоваться
+    в JSON.
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        _registry[task_name] = func
+        func.task_name = task_name
+        func.delay = lambda *args, **kwargs: enqueue(
+            task_name, *args, max_attempts=max_attempts, **kwargs
+        )
+        func.delay_once = lambda *args, **kwargs: enqueue_once(
+            task_name, *args, max_attempts=max_attempts, **kwargs
+        )
+        return func
+    return decorator
+
+
+def enqueue(name, *args, max_attempts=None, run_at=None, **kwargs):
+    """Ставит задачу в очередь в текущей транзакции.
+
+    Если транзакция будет отменена, задача не появится в очереди.
+    """
+    return Task.objects.create(
+        name=name,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def enqueue_once(name, *args, max_attempts=None, **kwargs):
+    """Ставит задачу в очередь, если такая же ещё не ждёт выполнения.
+
+    Выполняющаяся задача не считается: она могла прочитать данные
+    до изменения, ради которого задачу ставят снова.
+    """
+    pending = Task.objects.filter(
+        name=name, args=list(args), kwargs=kwargs, status=Task.PENDING
+    ).first()
+    if pending is not None:
+        return pending
+    return enqueue(name, *args, max_attempts=max_attempts, **kwargs)
+
+
+def release_stale_tasks():
+    """Возвращает в очередь задачи упавших обработчиков."""
+    deadline = timezone.now() - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    return Task.objects.filter(
+        status=Task.RUNNING, started_at__lt=deadline
+    ).update(status=Task.PENDING, locked_by='')
+
+
+def claim_task(worker):
+    """Забирает ближайшую задачу так, чтобы её не взял другой обработчик."""
+    candidates = Task.objects.filter(
+        status=Task.PENDING, run_at__lte=timezone.now()
+    ).order_by('run_at', 'pk').values_list('pk', flat=True)
+    for pk in candidates[:settings.TASKS_CLAIM_BATCH]:
+        claimed = Task.objects.filter(pk=pk, status=Task.PENDING).update(
+            status=Task.RUNNING,
+            locked_by=worker,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def run_task(task):
+    """Выполняет задачу; при ошибке повторяет её с растущей задержкой."""
+    func = _registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована')
+        func(*task.args, **task.kwargs)
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if task.attempts >= task.max_attempts:
+            task.status = Task.FAILED
+            logger.exception('Задача %s #%s не выполнена', task.name, task.pk)
+        else:
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * 2 ** (task.attempts - 1)
+            )
+    else:
+        task.status = Task.DONE
+    task.locked_by = ''
+    task.save(update_fields=['status', 'run_at', 'last_error', 'locked_by'])
+    return task
+
+
+@task(name='core.send_email')
+def send_email(message):
+    """Отправляет письмо, поставленное в очередь QueuedEmailBackend."""
+    from django.core.mail import EmailMultiAlternatives, get_connection
+
+    alternatives = message.pop('alternatives')
+    attachments = message.pop('attachments', [])
+    content_subtype = message.pop('content_subtype', 'plain')
+    email = EmailMultiAlternatives(
+        **message,
+        connection=get_connection(settings.TASKS_EMAIL_BACKEND),
+    )
+    email.content_subtype = content_subtype
+    for content, mimetype in alternatives:
+        email.attach_alternative(content, mimetype)
+    for attachment in attachments:
+        content = attachment.get('content')
+        if content is None:
+            content = b64decode(attachment['base64'])
+        email.attach(attachment['filename'], content, attachment['mimetype'])
+    email.send()
@@ -0,0 +1,37 @@
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+
+def warm_templates():
+    """Компилирует все шаблоны из каталогов DIRS при старте процесса.
+
+    С кэширующим загрузчиком скомпилированные шаблоны остаются
+    в памяти, и первый запрос к процессу не тратит время на разбор.
+    Возвращает число загруженных шаблонов.
+    """
+    loaded = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in map(Path, engine.engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception('Шаблон %s не скомпилирован', name)
+                    continue
+                loaded += 1
+    return loaded
+
+
+def warm_up():
+    """Прогрев процесса приложения, если он включён в настройках."""
+    if settings.TEMPLATES_WARMUP:
+        warm_templates()
@@ -41,6 +41,15 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +101,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.query_budget",
     "adapters.comment",
 ]
 
@@ -363,6 +373,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
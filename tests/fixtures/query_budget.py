@@ -0,0 +1,39 @@
+from typing import Callable
+
+import pytest
+from django.http import HttpResponse
+
+from core.query_budget import (
+    QueryBudgetExceeded,
+    QueryLog,
+    check_budget,
+    get_budget,
+)
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., HttpResponse]:
+    """Выполняет запрос тестового клиента и проверяет бюджет его маршрута.
+
+    Пример: `query_budget(user_client.get, "/")`. Тест падает, если
+    для маршрута нет бюджета в QUERY_BUDGETS или он превышен; в
+    сообщении перечислены повторяющиеся SQL-запросы.
+    """
+
+    def request(method, url, *args, **kwargs) -> HttpResponse:
+        with QueryLog() as log:
+            response = method(url, *args, **kwargs)
+        view_name = response.resolver_match.view_name
+        if get_budget(view_name) is None:
+            pytest.fail(
+                f"Задайте бюджет SQL-запросов для `{view_name}`"
+                " в настройке QUERY_BUDGETS.",
+                pytrace=False,
+            )
+        try:
+            check_budget(view_name, log.queries)
+        except QueryBudgetExceeded as error:
+            pytest.fail(str(error), pytrace=False)
+        return response
+
+    return request
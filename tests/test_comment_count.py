@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.db.models.signals import post_delete
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for _ in range(2):
+        user_client.post(
+            f"/posts/{post.id}/comment/", data={"text": "Комментарий"}
+        )
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает"
+        " `Post.comment_count`."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария уменьшает `Post.comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command("recount_comments")
+
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` исправляет счётчик."
+    )
+
+
+@pytest.mark.django_db
+def test_failed_post_delete_keeps_counting(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+
+    def fail(**kwargs):
+        raise DatabaseError("Удаление прервано")
+
+    post_delete.connect(fail, sender=Comment)
+    try:
+        with pytest.raises(DatabaseError), transaction.atomic():
+            post.delete()
+    finally:
+        post_delete.disconnect(fail, sender=Comment)
+
+    Comment.objects.filter(post=post).first().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что после неудачного удаления поста"
+        " счётчик его комментариев снова обновляется."
+    )
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/", "/profile/{username}/"])
+def test_feed_not_modified(user_client, user, post_with_published_location,
+                           url, django_assert_max_num_queries):
+    url = url.format(username=user.username)
+    etag = user_client.get(url)["ETag"]
+    with django_assert_max_num_queries(4):
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что лента отвечает 304 на совпадающий ETag."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_validators_follow_comments(
+        user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = user_client.get(url)
+    etag = response["ETag"]
+    assert not response.has_header("Last-Modified"), (
+        "Убедитесь, что страница поста не отдаёт Last-Modified: время"
+        " изменения поста не учитывает категорию, локацию и автора."
+    )
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.NOT_MODIFIED
+
+    user_client.post(f"{url}comment/", data={"text": "Новый комментарий"})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag страницы поста."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/", "/category/{slug}/"])
+def test_feed_etag_follows_related_changes(
+        user_client, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(slug=post.category.slug)
+    etag = user_client.get(url)["ETag"]
+    post.location.name = "Новое место"
+    post.location.save()
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag ленты меняется вместе с карточками постов."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_etag_skips_full_count(user_client, post_with_published_location):
+    etag = user_client.get("/")["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not any("COUNT(" in query["sql"] for query in queries), (
+        "Убедитесь, что ETag ленты берёт число постов из кэша, а не"
+        " считает всю ленту на каждый запрос."
+    )
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_viewer(
+        user_client, another_user_client, post_with_published_location
+):
+    etag = user_client.get("/")["ETag"]
+    response = another_user_client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url", ["/", "/?cursor=", "/category/{slug}/", "/profile/{username}/"]
+)
+def test_feed_not_modified_skips_card_query(
+        user_client, user, post_with_published_location, url
+):
+    url = url.format(
+        slug=post_with_published_location.category.slug,
+        username=user.username,
+    )
+    etag = user_client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    post_selects = [
+        query["sql"] for query in queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_selects) == 1, (
+        "Убедитесь, что ETag ленты строится одним запросом."
+    )
+    assert '"blog_location"' not in post_selects[0], (
+        "Убедитесь, что на 304 не выполняется запрос карточек"
+        " с `select_related`."
+    )
+    # Сессия, пользователь, профиль автора, окно страницы.
+    assert len(queries) <= 4
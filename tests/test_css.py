@@ -0,0 +1,99 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from core.css import (
+    defined_classes, html_classes, parse, purge, serialize, template_classes
+)
+
+CSS = (
+    "html{margin:0}.btn{padding:1px}.btn-lg,.modal{padding:2px}"
+    ".btn:not(.disabled):hover{color:red}"
+    "@media (min-width:576px){.modal{width:1px}.btn{width:2px}}"
+    "@keyframes spin{to{transform:rotate(1turn)}}"
+    ".spinner{animation:spin 1s}"
+)
+
+
+def test_parse_round_trip():
+    assert serialize(parse(f"/* comment */{CSS}")) == CSS
+
+
+def test_purge_keeps_used_rules():
+    purged = purge(CSS, {"btn", "btn-lg"})
+    assert purged == (
+        "html{margin:0}.btn{padding:1px}.btn-lg{padding:2px}"
+        ".btn:not(.disabled):hover{color:red}"
+        "@media (min-width:576px){.btn{width:2px}}"
+    ), (
+        "Убедитесь, что из CSS удаляются правила для классов,"
+        " которых нет в шаблонах."
+    )
+    assert "@keyframes spin" in purge(CSS, {"spinner"})
+
+
+def test_template_classes(tmp_path):
+    template = tmp_path / "page.html"
+    template.write_text(
+        '<a class="nav-link {% if active %}active{% endif %}"'
+        " class='{{ extra }} mb-2'>"
+    )
+    assert template_classes([template]) == {"nav-link", "active", "mb-2"}
+
+
+def test_build_css(tmp_path):
+    output = tmp_path / "bundle.css"
+    critical = tmp_path / "critical.html"
+    call_command(
+        "build_css", output=output, critical=critical, stdout=StringIO()
+    )
+    bundle = output.read_text()
+    assert ".card-body{" in bundle
+    assert ".modal{" not in bundle, (
+        "Убедитесь, что в собранный CSS не попадают неиспользуемые классы."
+    )
+    assert ".navbar-brand" in critical.read_text()
+    assert ".card-body" not in critical.read_text()
+
+
+@pytest.mark.django_db
+def test_bundle_styles_rendered_forms(
+        client, user_client, post_with_published_location
+):
+    post_id = post_with_published_location.id
+    pages = [
+        (client, "/login/"),
+        (client, "/auth/registration/"),
+        (client, "/password_reset/"),
+        (user_client, "/posts/create/"),
+        (user_client, f"/posts/{post_id}/edit/"),
+        (user_client, f"/posts/{post_id}/"),
+        (user_client, "/profile_edit/"),
+        (user_client, "/auth/password_change/"),
+    ]
+    rendered = set()
+    for page_client, url in pages:
+        rendered |= html_classes(page_client.get(url).content.decode())
+        # Неверная форма показывает классы ошибок проверки.
+        rendered |= html_classes(
+            page_client.post(url, data={}).content.decode()
+        )
+    assert {"btn-primary", "is-invalid"} <= rendered
+
+    static_dir = Path(settings.BASE_DIR) / "static" / "css"
+    # Правила Bootstrap, применимые к отрисованным классам.
+    needed = defined_classes(purge(
+        (static_dir / "bootstrap.min.css").read_text(encoding="utf-8"),
+        rendered,
+    ))
+    bundle = defined_classes(
+        (static_dir / "blogicum.min.css").read_text(encoding="utf-8")
+    )
+    missing = needed - bundle
+    assert not missing, (
+        f"Убедитесь, что в собранном CSS есть классы форм и кнопок:"
+        f" {sorted(missing)}. Пересоберите его командой build_css."
+    )
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import Http404
+
+from core.media import serve_media
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file():
+    name = default_storage.save("test_media.png", ContentFile(CONTENT))
+    yield name
+    default_storage.delete(name)
+
+
+def test_serves_whole_file(rf, media_file):
+    response = serve_media(rf.get("/"), media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert b"".join(response.streaming_content) == CONTENT
+    assert response["Content-Type"] == "image/png"
+    assert response["ETag"] and response["Last-Modified"], (
+        "Убедитесь, что медиафайлы отдаются с заголовками ETag"
+        " и Last-Modified."
+    )
+
+
+def test_serves_range(rf, media_file):
+    response = serve_media(rf.get("/", HTTP_RANGE="bytes=10-19"), media_file)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT, (
+        "Убедитесь, что на запрос с заголовком Range возвращается 206."
+    )
+    assert b"".join(response.streaming_content) == CONTENT[10:20]
+    assert response["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response["Content-Length"] == "10"
+
+    suffix = serve_media(rf.get("/", HTTP_RANGE="bytes=-5"), media_file)
+    assert b"".join(suffix.streaming_content) == CONTENT[-5:]
+
+    outside = serve_media(
+        rf.get("/", HTTP_RANGE=f"bytes={len(CONTENT)}-"), media_file
+    )
+    assert outside.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+
+def test_range_is_not_sendfile_capable(rf, media_file):
+    # wsgi.file_wrapper (uWSGI, mod_wsgi) отдаёт через sendfile всё
+    # от текущей позиции до конца файла, если у объекта есть fileno().
+    ranged = serve_media(rf.get("/", HTTP_RANGE="bytes=10-19"), media_file)
+    assert not hasattr(ranged.file_to_stream, "fileno"), (
+        "Убедитесь, что диапазон нельзя отдать через sendfile целиком."
+    )
+    whole = serve_media(rf.get("/"), media_file)
+    assert hasattr(whole.file_to_stream, "fileno")
+    ranged.file_to_stream.close()
+    whole.file_to_stream.close()
+
+
+def test_stale_if_range_serves_whole_file(rf, media_file):
+    response = serve_media(
+        rf.get("/", HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'),
+        media_file,
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert b"".join(response.streaming_content) == CONTENT
+
+
+def test_not_modified(rf, media_file):
+    etag = serve_media(rf.get("/"), media_file)["ETag"]
+    response = serve_media(rf.get("/", HTTP_IF_NONE_MATCH=etag), media_file)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что при совпадении ETag возвращается 304."
+    )
+
+
+@pytest.mark.parametrize(
+    ("mode", "header", "expected"),
+    [
+        ("x-accel-redirect", "X-Accel-Redirect", "/protected-media/{name}"),
+        ("x-sendfile", "X-Sendfile", "{path}"),
+    ],
+)
+def test_offload(rf, media_file, settings, mode, header, expected):
+    settings.MEDIA_SERVE_MODE = mode
+    response = serve_media(rf.get("/"), media_file)
+    assert response[header] == expected.format(
+        name=media_file, path=default_storage.path(media_file)
+    ), f"Убедитесь, что в режиме {mode} отдача файла передаётся серверу."
+    assert response.content == b""
+
+
+def test_rejects_paths_outside_media_root(rf):
+    with pytest.raises(Http404):
+        serve_media(rf.get("/"), "../manage.py")
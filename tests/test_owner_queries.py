@@ -0,0 +1,150 @@
+import pytest
+from django.db import connection
+from django.shortcuts import resolve_url
+from django.test.utils import CaptureQueriesContext
+
+
+def post_queries(queries):
+    return [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_post"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "page, expected", [
+        # Пост, сессия, пользователь, локации и категории для формы.
+        ("edit", 5),
+        # Пост, сессия, пользователь.
+        ("delete", 3),
+    ]
+)
+def test_post_owner_pages_fetch_post_once(
+        user_client, post_with_published_location, page, expected
+):
+    url = f"/posts/{post_with_published_location.id}/{page}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert len(post_queries(queries)) == 1, (
+        f"Убедитесь, что страница `{url}` загружает пост из базы"
+        " один раз: проверка автора и форма должны использовать"
+        " один и тот же объект."
+    )
+    assert len(queries) == expected, (
+        f"Убедитесь, что страница `{url}` выполняет не больше"
+        f" {expected} запросов к базе данных."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["edit", "delete"])
+def test_post_owner_check_does_not_load_author(
+        another_user_client, post_with_published_location, page
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.get(f"/posts/{post.id}/{page}/")
+    assert response.status_code == 302
+    # Пост, сессия и пользователь запроса; автор поста не загружается.
+    assert len(queries) == 3, (
+        "Убедитесь, что для проверки автора поста сравнивается"
+        " `author_id`, а не загружается объект автора."
+    )
+
+
+@pytest.mark.django_db
+def test_delete_page_shows_post(user_client, post_with_published_location):
+    post = post_with_published_location
+    content = user_client.get(f"/posts/{post.id}/delete/").content.decode()
+    assert post.title in content, (
+        "Убедитесь, что страница удаления показывает удаляемый пост."
+    )
+    assert post.location.name in content
+
+
+@pytest.mark.django_db
+def test_delete_post_requires_login(
+        settings, client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            f"/posts/{post_with_published_location.id}/delete/"
+        )
+    assert response.status_code == 302
+    assert response["Location"].startswith(
+        resolve_url(settings.LOGIN_URL)
+    ), (
+        "Убедитесь, что анонимного пользователя со страницы удаления"
+        " поста перенаправляет на вход."
+    )
+    assert not post_queries(queries)
+
+
+@pytest.mark.django_db
+def test_delete_post_fetches_post_once(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == 302
+    assert len(post_queries(queries)) == 1, (
+        "Убедитесь, что при удалении поста он загружается из базы один раз."
+    )
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "page, method, expected", [
+        # Сессия, пользователь, комментарий.
+        ("edit_comment", "get", 3),
+        ("delete_comment", "get", 3),
+        # Плюс запись комментария и обновление счётчика у поста.
+        ("edit_comment", "post", 5),
+        ("delete_comment", "post", 5),
+    ]
+)
+def test_comment_owner_pages_queries(
+        user_client, own_comment, page, method, expected
+):
+    url = f"/posts/{own_comment.post_id}/{page}/{own_comment.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        getattr(user_client, method)(url, data={"text": "Новый текст"})
+    comment_selects = [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "blog_comment"' in query["sql"]
+    ]
+    assert len(comment_selects) == 1, (
+        f"Убедитесь, что `{url}` загружает комментарий из базы один раз."
+    )
+    assert len(queries) == expected, (
+        f"Убедитесь, что `{method.upper()} {url}` выполняет не больше"
+        f" {expected} запросов к базе данных: автор комментария и пост"
+        " не должны загружаться отдельно."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("page", ["edit_comment", "delete_comment"])
+def test_comment_owner_check_does_not_load_author(
+        another_user_client, own_comment, page
+):
+    url = f"/posts/{own_comment.post_id}/{page}/{own_comment.id}/"
+    with CaptureQueriesContext(connection) as queries:
+        response = another_user_client.get(url)
+    assert response.status_code == 302
+    assert len(queries) == 3, (
+        "Убедитесь, что для проверки автора комментария сравнивается"
+        " `author_id`, а не загружается объект автора."
+    )
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.caching import page_cache_stats, seconds_until_next_publication
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_served_from_cache(
+        client, user_client, post_with_published_location
+):
+    first = client.get("/")
+    second = client.get("/")
+    assert first["X-Page-Cache"] == "MISS"
+    assert second["X-Page-Cache"] == "HIT", (
+        "Убедитесь, что главная страница для анонимов берётся из кэша."
+    )
+    assert second.content == first.content
+    assert page_cache_stats() == {"hit": 1, "miss": 1}
+
+    assert "X-Page-Cache" not in user_client.get("/"), (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
+
+
+@pytest.mark.django_db
+def test_page_cache_purged_on_post_change(
+        client, post_with_published_location
+):
+    client.get("/")
+    post_with_published_location.title = "Обновлённый заголовок"
+    post_with_published_location.save()
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert "Обновлённый заголовок" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_page_cache_ttl_capped_by_scheduled_post(mixer, user):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    timeout = seconds_until_next_publication(Post.objects.all(), 300)
+    assert 0 < timeout <= 31, (
+        "Убедитесь, что кэш ленты живёт не дольше, чем до ближайшей"
+        " отложенной публикации."
+    )
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import pytest
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import pagitane
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def dated_posts(mixer, user, published_category):
+    now = timezone.now()
+    pub_dates = (now - timedelta(hours=i) for i in range(N_PER_PAGE * 2 + 5))
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_feed(user_client, dated_posts):
+    expected = [post.pk for post in dated_posts]
+    seen = []
+    cursors = []
+    url = "/?cursor="
+    while url:
+        response = user_client.get(url)
+        page_obj = response.context["page_obj"]
+        seen.extend(post.pk for post in page_obj)
+        cursors.append(url)
+        url = (
+            f"/?cursor={page_obj.next_cursor}"
+            if page_obj.has_next() else None
+        )
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация проходит ленту без пропусков"
+        " и повторов в порядке убывания даты публикации."
+    )
+
+    last_page = user_client.get(cursors[-1]).context["page_obj"]
+    previous = user_client.get(f"/?cursor={last_page.previous_cursor}")
+    assert [post.pk for post in previous.context["page_obj"]] == (
+        expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ), "Убедитесь, что ссылка на предыдущую страницу ведёт назад по ленте."
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_ignores_broken_token(user_client, dated_posts):
+    response = user_client.get("/?cursor=not-a-cursor")
+    page_obj = response.context["page_obj"]
+    assert [post.pk for post in page_obj] == [
+        post.pk for post in dated_posts[:N_PER_PAGE]
+    ]
+    assert not page_obj.has_previous()
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached_and_invalidated(
+        user_client, dated_posts, mixer
+):
+    page_obj = user_client.get("/").context["page_obj"]
+    assert page_obj.paginator.count == len(dated_posts)
+
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/")
+    assert not any("COUNT(" in query["sql"] for query in queries), (
+        "Убедитесь, что число постов ленты берётся из кэша."
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=dated_posts[0].author,
+        category=dated_posts[0].category,
+        is_published=True,
+        pub_date=dated_posts[-1].pub_date,
+    )
+    page_obj = user_client.get("/").context["page_obj"]
+    assert page_obj.paginator.count == len(dated_posts) + 1, (
+        "Убедитесь, что кэш числа постов сбрасывается при сохранении поста."
+    )
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+        if isinstance(self.rows[0], Exception):
+            raise self.rows.pop(0)
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+
+class FakePostgres:
+    vendor = "postgresql"
+    alias = "default"
+
+    def __init__(self, *rows):
+        self.fake_cursor = FakeCursor(rows)
+
+    def cursor(self):
+        return self.fake_cursor
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("plan", [
+    # psycopg2 разбирает колонку json сам.
+    [{"Plan": {"Plan Rows": 1234}}],
+    '[{"Plan": {"Plan Rows": 1234}}]',
+])
+def test_estimate_count_reads_explain_row(monkeypatch, settings, plan):
+    settings.FEED_COUNT_ESTIMATE_THRESHOLD = 1000
+    fake = FakePostgres((5000.0,), (plan,))
+    monkeypatch.setattr(pagitane, "connections", {"default": fake})
+    assert pagitane.estimate_count(Post.objects.published()) == 1234
+    assert fake.fake_cursor.executed[-1].startswith("EXPLAIN (FORMAT JSON)")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("rows", [
+    ((100.0,),),
+    ((5000.0,), DatabaseError("нет доступа")),
+    ((5000.0,), ("не план",)),
+])
+def test_estimate_count_falls_back_to_exact_count(
+        monkeypatch, settings, rows
+):
+    settings.FEED_COUNT_ESTIMATE_THRESHOLD = 1000
+    monkeypatch.setattr(
+        pagitane, "connections", {"default": FakePostgres(*rows)}
+    )
+    assert pagitane.estimate_count(Post.objects.published()) is None, (
+        "Убедитесь, что без оценки Postgres число постов считается честно."
+    )
@@ -0,0 +1,42 @@
+import pytest
+
+
+def rendered_cards(response):
+    return [
+        template for template in response.templates
+        if template.name == "includes/post_card.html"
+    ]
+
+
+@pytest.mark.django_db
+def test_post_card_rendered_once(user_client, post_with_published_location):
+    assert len(rendered_cards(user_client.get("/"))) == 1
+    assert not rendered_cards(user_client.get("/")), (
+        "Убедитесь, что карточка поста берётся из кэша при повторном показе."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_invalidated_by_related_models(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    post.category.title = "Новое название категории"
+    post.category.save()
+    assert post.category.title in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточки постов сбрасываются при изменении категории."
+    )
+
+    post.author.username = "renamed_author"
+    post.author.save()
+    assert "@renamed_author" in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточки постов сбрасываются при изменении автора."
+    )
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert post.title in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка сбрасывается при изменении поста."
+    )
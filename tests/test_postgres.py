@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+from blog.pagitane import estimate_count
+
+
+@pytest.mark.django_db
+def test_brin_indexes_follow_database_vendor():
+    with connection.cursor() as cursor:
+        indexes = set(connection.introspection.get_constraints(
+            cursor, Post._meta.db_table
+        )) | set(connection.introspection.get_constraints(
+            cursor, Comment._meta.db_table
+        ))
+    assert "post_pub_date_brin" not in indexes, (
+        "Убедитесь, что у Post.pub_date нет BRIN-индекса: отложенные"
+        " публикации нарушают порядок дат относительно строк."
+    )
+    if connection.vendor == "postgresql":
+        assert "comment_created_brin" in indexes, (
+            "Убедитесь, что в PostgreSQL создан BRIN-индекс"
+            " по дате комментария."
+        )
+    else:
+        assert "comment_created_brin" not in indexes
+
+
+@pytest.mark.django_db
+def test_admin_exports_posts_as_csv(admin_client, post_with_published_location):
+    response = admin_client.post(
+        "/admin/blog/post/",
+        {
+            "action": "export_csv",
+            "_selected_action": [post_with_published_location.pk],
+        },
+    )
+    assert response.streaming, (
+        "Убедитесь, что выгрузка постов в CSV отдаётся потоком."
+    )
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0].startswith("pk,title")
+    assert lines[1].startswith(f"{post_with_published_location.pk},")
+
+
+@pytest.mark.django_db
+def test_estimate_count_reads_postgres_plan(
+        settings, post_with_published_location
+):
+    if connection.vendor != "postgresql":
+        pytest.skip("Оценка по EXPLAIN есть только в PostgreSQL.")
+    settings.FEED_COUNT_ESTIMATE_THRESHOLD = 0
+    # До ANALYZE reltuples в PostgreSQL 14+ равен -1.
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Post._meta.db_table}")
+    estimate = estimate_count(Post.objects.published())
+    assert isinstance(estimate, int), (
+        "Убедитесь, что число постов оценивается по плану запроса"
+        " PostgreSQL."
+    )
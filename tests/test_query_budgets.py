@@ -0,0 +1,210 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import urls as blog_urls
+from core.middleware import QueryBudgetMiddleware
+from core.query_budget import (
+    QueryBudgetExceeded, QueryLog, check_budget, duplicate_queries
+)
+from pages import urls as pages_urls
+
+N_POSTS = 12
+N_COMMENTS = 3
+
+
+@pytest.fixture
+def site(mixer, user, another_user, published_category, published_location):
+    """Данных столько, чтобы запросы N+1 вышли за бюджет."""
+    posts = mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=timezone.now(),
+    )
+    for post in posts:
+        mixer.cycle(N_COMMENTS).blend(
+            "blog.Comment", post=post, author=another_user
+        )
+    comment = mixer.blend("blog.Comment", post=posts[0], author=user)
+    return {
+        "user": user,
+        "category": published_category,
+        "location": published_location,
+        "post": posts[0],
+        "comment": comment,
+    }
+
+
+def route_kwargs(view_name, site):
+    post_id = site["post"].id
+    return {
+        "blog:category_posts": {"slug": site["category"].slug},
+        "blog:post_detail": {"post_id": post_id},
+        "blog:edit_post": {"post_id": post_id},
+        "blog:delete_post": {"post_id": post_id},
+        "blog:profile": {"username": site["user"].username},
+        "blog:add_comment": {"post_id": post_id},
+        "blog:edit_comment": {
+            "post_id": post_id, "comment_id": site["comment"].id
+        },
+        "blog:delete_comment": {
+            "post_id": post_id, "comment_id": site["comment"].id
+        },
+    }.get(view_name, {})
+
+
+def post_data(site):
+    return {
+        "title": "Заголовок",
+        "text": "Текст поста",
+        "pub_date": "2023-01-01 12:00:00",
+        "category": site["category"].id,
+        "location": site["location"].id,
+        "is_published": True,
+    }
+
+
+GET_ROUTES = (
+    "blog:index",
+    "blog:category_posts",
+    "blog:post_detail",
+    "blog:create_post",
+    "blog:edit_post",
+    "blog:delete_post",
+    "blog:profile",
+    "blog:edit_profile",
+    "blog:edit_comment",
+    "blog:delete_comment",
+    "pages:about",
+    "pages:rules",
+)
+PUBLIC_ROUTES = (
+    "blog:index",
+    "blog:category_posts",
+    "blog:profile",
+    "pages:about",
+    "pages:rules",
+)
+POST_ROUTES = {
+    "blog:create_post": post_data,
+    "blog:edit_post": post_data,
+    "blog:delete_post": lambda site: {},
+    "blog:edit_profile": lambda site: {
+        "username": site["user"].username, "email": "author@example.com",
+    },
+    "blog:add_comment": lambda site: {"text": "Комментарий"},
+    "blog:edit_comment": lambda site: {"text": "Новый текст"},
+    "blog:delete_comment": lambda site: {},
+}
+
+
+def route_names():
+    return {
+        f"{module.app_name}:{pattern.name}"
+        for module in (blog_urls, pages_urls)
+        for pattern in module.urlpatterns
+    }
+
+
+def test_every_route_is_budgeted(settings):
+    routes = route_names()
+    missing = routes - set(settings.QUERY_BUDGETS)
+    assert not missing, (
+        f"Задайте бюджет SQL-запросов для маршрутов: {sorted(missing)}."
+    )
+    untested = routes - set(GET_ROUTES) - set(POST_ROUTES)
+    assert not untested, (
+        f"Добавьте проверку бюджета для маршрутов: {sorted(untested)}."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", GET_ROUTES)
+def test_get_within_budget(user_client, site, query_budget, view_name):
+    url = reverse(view_name, kwargs=route_kwargs(view_name, site))
+    response = query_budget(user_client.get, url)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", PUBLIC_ROUTES)
+def test_anonymous_get_within_budget(client, site, query_budget, view_name):
+    url = reverse(view_name, kwargs=route_kwargs(view_name, site))
+    response = query_budget(client.get, url)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", POST_ROUTES)
+def test_post_within_budget(user_client, site, query_budget, view_name):
+    url = reverse(view_name, kwargs=route_kwargs(view_name, site))
+    data = POST_ROUTES[view_name](site)
+    response = query_budget(user_client.post, url, data=data)
+    assert response.status_code == 302, (
+        f"Убедитесь, что форма на `{url}` принимает тестовые данные."
+    )
+
+
+@pytest.mark.django_db
+def test_cached_page_skips_database(client, site, query_budget):
+    query_budget(client.get, "/")
+    with QueryLog() as log:
+        client.get("/")
+    assert len(log) == 0, (
+        "Убедитесь, что повторный запрос главной страницы анонимом"
+        " отдаётся из кэша без запросов к базе данных."
+    )
+
+
+@pytest.mark.django_db
+def test_report_lists_duplicate_queries(user):
+    with QueryLog() as log:
+        for pk in range(3):
+            User.objects.filter(pk=user.pk + pk).exists()
+    duplicates = duplicate_queries(log.queries)
+    assert len(duplicates) == 1 and duplicates[0][1] == 3
+    with override_settings(QUERY_BUDGETS={"blog:index": 2}):
+        with pytest.raises(QueryBudgetExceeded) as error:
+            check_budget("blog:index", log.queries)
+    message = str(error.value)
+    assert "3 SQL-запросов при бюджете 2" in message
+    assert f"3 × {duplicates[0][0]}" in message, (
+        "Убедитесь, что отчёт о превышении бюджета перечисляет"
+        " повторяющиеся запросы."
+    )
+
+
+@pytest.mark.django_db
+def test_middleware_enforces_budget_in_debug(rf, user):
+    def view(request):
+        for pk in range(3):
+            User.objects.filter(pk=user.pk + pk).exists()
+        request.resolver_match = type(
+            "Match", (), {"view_name": "pages:about"}
+        )()
+        return "response"
+
+    middleware = QueryBudgetMiddleware(view)
+    with override_settings(QUERY_BUDGETS={"pages:about": 2}):
+        with override_settings(DEBUG=False):
+            assert middleware(rf.get("/")) == "response"
+        with override_settings(DEBUG=True):
+            with pytest.raises(QueryBudgetExceeded):
+                middleware(rf.get("/"))
+        with override_settings(DEBUG=True, QUERY_BUDGETS={}):
+            assert middleware(rf.get("/")) == "response"
+
+
+@pytest.mark.django_db
+def test_query_log_ignores_connection_setup(user):
+    with QueryLog() as log:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+        User.objects.filter(pk=user.pk).exists()
+    assert len(log) == 1
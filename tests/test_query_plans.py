@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_feed_queries_use_indexes():
+    from blog.checks import check_feed_query_plans
+
+    errors = check_feed_query_plans(databases=["default"])
+    assert not errors, (
+        "Убедитесь, что запросы лент используют индексы: "
+        + "; ".join(error.msg for error in errors)
+    )
+
+
+@pytest.mark.django_db
+def test_published_uses_join_instead_of_subquery():
+    from django.db import connection
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    if connection.vendor != "sqlite":
+        pytest.skip("План сравнивается в формате EXPLAIN QUERY PLAN SQLite.")
+
+    old_plan = Post.objects.filter(
+        is_published=True, pub_date__lte=timezone.now()
+    ).exclude(
+        category__in=Category.objects.filter(is_published=False)
+    ).explain()
+    new_plan = Post.objects.published().explain()
+    assert "SUBQUERY" in old_plan
+    assert "SUBQUERY" not in new_plan, (
+        "Убедитесь, что проверка публикации категории выполняется через JOIN,"
+        " а не через подзапрос."
+    )
+    assert "SCAN" not in new_plan
+
+
+@pytest.mark.django_db
+def test_feed_query_count(
+        user_client, many_posts_with_published_locations,
+        django_assert_max_num_queries
+):
+    with django_assert_max_num_queries(6):
+        user_client.get("/")
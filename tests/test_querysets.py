@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import Truncator
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_for_cards_skips_text(post_with_published_location):
+    post = Post.objects.for_cards().get()
+    assert post.get_deferred_fields() == {"text"}, (
+        "Убедитесь, что карточки постов не загружают полный текст поста."
+    )
+    assert post.excerpt == Truncator(
+        post_with_published_location.text
+    ).words(10)
+
+
+@pytest.mark.django_db
+def test_with_comment_count_undefers_counter(post_with_published_location):
+    post = Post.objects.only("title").with_comment_count().get()
+    assert "comment_count" not in post.get_deferred_fields()
+    post = Post.objects.defer(
+        "text", "comment_count"
+    ).with_comment_count().get()
+    assert post.get_deferred_fields() == {"text"}
+
+
+@pytest.mark.django_db
+def test_for_viewer(
+        user, another_user, mixer, post_with_published_location
+):
+    hidden = mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=post_with_published_location.category,
+    )
+    assert set(Post.objects.for_viewer(user)) == {
+        post_with_published_location, hidden
+    }
+    assert set(Post.objects.for_viewer(another_user)) == {
+        post_with_published_location
+    }
+    assert set(Post.objects.for_viewer(AnonymousUser())) == {
+        post_with_published_location
+    }
+
+
+@pytest.mark.django_db
+def test_posts_without_category_stay_listed(
+        client, another_user_client, user, mixer,
+        post_with_published_location
+):
+    post = post_with_published_location
+    hidden = mixer.blend(
+        "blog.Post", author=user,
+        category=mixer.blend("blog.Category", is_published=False),
+    )
+    post.category.delete()
+    post.refresh_from_db()
+    assert post.category is None
+    assert set(Post.objects.published()) == {post}
+    for viewer, url in (
+            (client, "/"),
+            (client, f"/profile/{user.username}/"),
+            (another_user_client, f"/posts/{post.pk}/"),
+    ):
+        content = viewer.get(url).content.decode()
+        assert post.title in content, (
+            f"Убедитесь, что на странице `{url}` показываются посты,"
+            " категория которых удалена."
+        )
+        assert hidden.title not in content
+
+
+@pytest.mark.django_db
+def test_backfill_excerpts(post_with_published_location):
+    Post.objects.update(excerpt="")
+    call_command("backfill_excerpts")
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.excerpt == Truncator(
+        post_with_published_location.text
+    ).words(10), "Убедитесь, что `backfill_excerpts` заполняет `excerpt`."
+
+
+@pytest.mark.django_db
+def test_partial_save_does_not_load_deferred_text(
+        post_with_published_location
+):
+    post = Post.objects.for_cards().get()
+    post.title = "Новый заголовок"
+    with CaptureQueriesContext(connection) as queries:
+        post.save(update_fields=["title"])
+    assert not any(
+        query["sql"].startswith("SELECT") and 'FROM "blog_post"' in query["sql"]
+        for query in queries
+    ), (
+        "Убедитесь, что сохранение отдельных полей поста не загружает"
+        " отложенный текст ради `excerpt`."
+    )
+    assert "text" in post.get_deferred_fields()
@@ -0,0 +1,86 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.caching import get_version
+from blog.models import Post
+from blog.renditions import RENDITION_WIDTHS, generate_renditions
+
+
+@pytest.mark.django_db
+def test_generate_renditions_command(
+        user_client, post_with_published_location
+):
+    call_command("generate_renditions")
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    assert post.renditions["source"] == post.image.name
+    for key in RENDITION_WIDTHS:
+        assert set(post.renditions[key]) >= {"jpeg"}
+        for name in post.renditions[key].values():
+            assert post.image.storage.exists(name)
+
+    content = user_client.get(f"/posts/{post.pk}/").content.decode()
+    assert post.srcset["jpeg"] in content, (
+        "Убедитесь, что страница поста предлагает копии изображения"
+        " через `srcset`."
+    )
+
+
+@pytest.mark.django_db
+def test_renditions_dropped_with_image(post_with_published_location):
+    call_command("generate_renditions")
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    post.image = None
+    post.save()
+    assert Post.objects.get(pk=post.pk).renditions == {}
+
+
+@pytest.mark.django_db
+def test_renditions_invalidate_cached_pages(
+        client, post_with_published_location
+):
+    assert client.get("/")["X-Page-Cache"] == "MISS"
+    page_version = get_version("page")
+    card_version = get_version("post_card")
+    call_command("generate_renditions")
+    assert get_version("page") != page_version
+    assert get_version("post_card") == card_version, (
+        "Убедитесь, что создание копий не сбрасывает кэш всех карточек:"
+        " их ключ уже содержит `updated_at`."
+    )
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "MISS", (
+        "Убедитесь, что после создания копий изображения"
+        " закэшированные страницы лент сбрасываются."
+    )
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    assert post.srcset["jpeg"] in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_renditions_keep_transparency_for_webp(
+        mixer, user, published_category
+):
+    image = Image.new("RGBA", (100, 100), (0, 0, 0, 0))
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ImageFile(buffer, name="transparent.png"),
+    )
+    renditions = generate_renditions(post)
+    storage = post.image.storage
+    with storage.open(renditions["card"]["jpeg"]) as file:
+        assert Image.open(file).convert("RGB").getpixel((0, 0)) == (
+            255, 255, 255
+        ), "Убедитесь, что прозрачность в JPEG заливается белым."
+    if "webp" in renditions["card"]:
+        with storage.open(renditions["card"]["webp"]) as file:
+            webp = Image.open(file)
+            assert webp.mode == "RGBA", (
+                "Убедитесь, что копия WebP сохраняет прозрачность."
+            )
+            assert webp.getpixel((0, 0))[3] == 0
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.core.cache import caches
+from django.db import router
+from django.http import HttpResponse
+
+from blog.caching import bump_version, post_card_key
+from blog.models import Post
+from blog.pagitane import CachedCountPaginator
+from blog.templatetags.blog_tags import post_card
+from core.middleware import ReplicaStickinessMiddleware
+from core.routers import use_primary
+
+MANAGE_DIR = Path(__file__).resolve().parent.parent / "blogicum"
+
+# Автор и пост создаются только в основной базе: реплика-заглушка
+# не реплицируется, поэтому по ответу видно, из какой базы читала страница.
+# Профиль не кэшируется и читается с реплики, пока нет cookie после записи;
+# страница ленты для кэша всегда строится по основной базе.
+TWO_SQLITE_FILES = """
+import django
+django.setup()
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+from blog.models import Category, Post
+
+call_command("migrate", verbosity=0)
+call_command("migrate", database="replica_1", verbosity=0)
+author = User.objects.create_user("author")
+category = Category.objects.create(title="c", description="c", slug="c")
+Post.objects.create(
+    title="primary-only", text="t", author=author, category=category,
+    pub_date=timezone.now(),
+)
+client = Client()
+print(client.get("/profile/author/").status_code)
+print("primary-only" in client.get("/").content.decode())
+client.post("/auth/login/", {"username": "nobody", "password": "x"})
+cache.clear()
+print(client.get("/profile/author/").status_code)
+"""
+
+
+def test_router_sends_reads_to_replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    assert router.db_for_read(Post) == "replica_1", (
+        "Убедитесь, что чтение направляется на реплику."
+    )
+    assert router.db_for_write(Post) == "default"
+    with use_primary():
+        assert router.db_for_read(Post) == "default"
+
+
+def test_stickiness_after_write(settings, rf):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    reads = []
+
+    def get_response(request):
+        reads.append(router.db_for_read(Post))
+        return HttpResponse()
+
+    middleware = ReplicaStickinessMiddleware(get_response)
+    middleware(rf.get("/"))
+    response = middleware(rf.post("/posts/1/comment/"))
+    cookie = settings.REPLICA_STICKY_COOKIE
+    assert response.cookies[cookie]["max-age"] == (
+        settings.REPLICA_STICKY_SECONDS
+    )
+    sticky = rf.get("/")
+    sticky.COOKIES[cookie] = "1"
+    middleware(sticky)
+    assert reads == ["replica_1", "default", "default"], (
+        "Убедитесь, что запросы на запись и чтения сразу после записи"
+        " идут в основную базу."
+    )
+
+
+@pytest.mark.django_db
+def test_cache_refills_read_primary(
+        settings, client, post_with_published_location
+):
+    # Реплики нет в DATABASES: любое чтение с неё упадёт.
+    settings.DATABASE_REPLICAS = ["missing_replica"]
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "MISS", (
+        "Убедитесь, что страница для кэша строится по основной базе."
+    )
+    paginator = CachedCountPaginator(
+        Post.objects.published(), 10, count_key=("index",)
+    )
+    assert paginator.count == 1, (
+        "Убедитесь, что число постов для кэша считается по основной базе."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_from_replica_not_cached_after_bump(
+        settings, post_with_published_location
+):
+    post = Post.objects.with_feed_related().get(
+        pk=post_with_published_location.pk
+    )
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    post._state.db = "replica_1"
+    bump_version("post_card")
+    post_card(post)
+    card_cache = caches[settings.POST_CARD_CACHE]
+    assert card_cache.get(post_card_key(post)) is None, (
+        "Убедитесь, что сразу после смены версии карточка, прочитанная"
+        " с реплики, не кладётся в кэш."
+    )
+    post._state.db = "default"
+    post_card(post)
+    assert card_cache.get(post_card_key(post)) is not None
+
+
+def test_two_sqlite_files(tmp_path):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "blogicum.settings",
+        "SQLITE_PATH": str(tmp_path / "primary.sqlite3"),
+        "SQLITE_REPLICAS": str(tmp_path / "replica.sqlite3"),
+    }
+    env.pop("POSTGRES_DB", None)
+    output = subprocess.run(
+        [sys.executable, "-c", TWO_SQLITE_FILES],
+        cwd=MANAGE_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert output == ["404", "True", "200"], (
+        "Убедитесь, что чтения идут на реплику, после запроса на запись —"
+        " на основную базу, а страницы для кэша строятся по основной базе."
+    )
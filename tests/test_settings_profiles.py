@@ -0,0 +1,43 @@
+from importlib import import_module
+
+import pytest
+
+from core.management.commands.bench_requests import run_benchmark
+
+
+def test_prod_profile_performance_defaults():
+    prod = import_module("blogicum.settings.prod")
+    assert not prod.DEBUG
+    assert prod.DATABASES["default"]["CONN_MAX_AGE"] > 0, (
+        "Убедитесь, что в профиле prod соединения с базой переиспользуются."
+    )
+    loaders = prod.TEMPLATES[0]["OPTIONS"]["loaders"]
+    assert loaders[0][0] == "django.template.loaders.cached.Loader"
+    assert "debug_toolbar" not in prod.INSTALLED_APPS, (
+        "Убедитесь, что debug toolbar подключается только в профиле dev."
+    )
+    assert not any("debug_toolbar" in name for name in prod.MIDDLEWARE)
+
+
+def test_prod_versions_survive_culling():
+    prod = import_module("blogicum.settings.prod")
+    versions = prod.CACHES[prod.VERSION_CACHE]
+    for alias, cache in prod.CACHES.items():
+        assert "MAX_ENTRIES" in cache["OPTIONS"], (
+            f"Убедитесь, что для кэша {alias} задан MAX_ENTRIES."
+        )
+        if alias != prod.VERSION_CACHE:
+            assert (cache["LOCATION"], cache.get("KEY_PREFIX")) != (
+                versions["LOCATION"], versions.get("KEY_PREFIX")
+            ), (
+                "Убедитесь, что версии ключей не вытесняются"
+                " вместе с карточками и страницами."
+            )
+
+
+@pytest.mark.django_db
+def test_run_benchmark():
+    results = run_benchmark(requests=2, posts=3)
+    assert "/" in results
+    for result in results.values():
+        assert 0 < result["median"]
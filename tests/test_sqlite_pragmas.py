@@ -0,0 +1,19 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied(settings):
+    if connection.vendor != "sqlite":
+        pytest.skip("PRAGMA применяются только к SQLite.")
+    with connection.cursor() as cursor:
+        for name in ("synchronous", "busy_timeout", "cache_size"):
+            cursor.execute(f"PRAGMA {name}")
+            value = cursor.fetchone()[0]
+            expected = settings.SQLITE_PRAGMAS[name]
+            if name == "synchronous":
+                expected = {"off": 0, "normal": 1, "full": 2}[expected]
+            assert value == expected, (
+                f"Убедитесь, что при подключении к SQLite выполняется"
+                f" `PRAGMA {name}` из настройки SQLITE_PRAGMAS."
+            )
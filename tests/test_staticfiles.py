@@ -0,0 +1,104 @@
+import gzip
+from http import HTTPStatus
+
+import brotli
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import override_settings
+
+from core.staticfiles import serve_static
+
+
+def collected_settings(root):
+    return override_settings(
+        STATIC_ROOT=root,
+        STATICFILES_STORAGE=(
+            "core.staticfiles.CompressedManifestStaticFilesStorage"
+        ),
+    )
+
+
+@pytest.fixture(scope="module")
+def collected_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("static")
+    with collected_settings(root):
+        call_command("collectstatic", interactive=False, verbosity=0)
+    return root
+
+
+@pytest.fixture
+def collected(collected_root):
+    with collected_settings(collected_root):
+        yield collected_root
+
+
+def test_collectstatic_writes_compressed_copies(collected):
+    hashed = staticfiles_storage.stored_name("css/bootstrap.min.css")
+    assert hashed != "css/bootstrap.min.css", (
+        "Убедитесь, что собранная статика получает имена с хэшем."
+    )
+    original = (collected / hashed).read_bytes()
+    assert gzip.decompress((collected / f"{hashed}.gz").read_bytes()) == (
+        original
+    )
+    assert brotli.decompress((collected / f"{hashed}.br").read_bytes()) == (
+        original
+    )
+    assert not (collected / "img/logo.png.gz").exists(), (
+        "Убедитесь, что уже сжатые изображения не сжимаются повторно."
+    )
+
+
+def test_serve_static_picks_encoding(rf, collected):
+    hashed = staticfiles_storage.stored_name("css/bootstrap.min.css")
+
+    response = serve_static(
+        rf.get("/", HTTP_ACCEPT_ENCODING="gzip, deflate, br"), hashed
+    )
+    assert response["Content-Encoding"] == "br"
+    assert response["Content-Type"] == "text/css"
+    assert "Accept-Encoding" in response["Vary"]
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что статика с хэшем в имени отдаётся"
+        " с заголовком `Cache-Control: immutable`."
+    )
+
+    response = serve_static(
+        rf.get("/", HTTP_ACCEPT_ENCODING="gzip, br;q=0"), hashed
+    )
+    assert response["Content-Encoding"] == "gzip"
+
+    response = serve_static(rf.get("/"), hashed)
+    assert not response.has_header("Content-Encoding")
+    assert b"".join(response.streaming_content) == (
+        (collected / hashed).read_bytes()
+    )
+
+
+def test_serve_static_revalidates_unhashed_names(rf, collected):
+    response = serve_static(rf.get("/"), "css/bootstrap.min.css")
+    assert "immutable" not in response["Cache-Control"]
+    assert "no-cache" in response["Cache-Control"]
+
+    etag = response["ETag"]
+    revalidated = serve_static(
+        rf.get("/", HTTP_IF_NONE_MATCH=etag), "css/bootstrap.min.css"
+    )
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что статика без хэша в имени отвечает 304"
+        " на совпадающий ETag."
+    )
+    assert "no-cache" in revalidated["Cache-Control"]
+    revalidated = serve_static(
+        rf.get("/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]),
+        "css/bootstrap.min.css",
+    )
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+    compressed = serve_static(
+        rf.get("/", HTTP_ACCEPT_ENCODING="gzip"), "css/bootstrap.min.css"
+    )
+    assert compressed["ETag"] != etag, (
+        "Убедитесь, что у сжатой копии свой ETag."
+    )
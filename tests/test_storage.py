@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from blog.models import Post
+from blog.views import post_image
+
+
+@pytest.fixture
+def storage():
+    return Post._meta.get_field("image").storage
+
+
+@pytest.mark.django_db
+def test_identical_images_are_stored_once(
+        post_with_published_location, mixer
+):
+    image = post_with_published_location.image
+    image.open()
+    content = image.read()
+    image.close()
+    copy = mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        image=ContentFile(content, name="copy.jpg"),
+    )
+    assert copy.image.name.startswith("posts/")
+    assert copy.image.name == post_with_published_location.image.name, (
+        "Убедитесь, что одинаковые изображения сохраняются в один файл,"
+        " названный по хэшу содержимого."
+    )
+
+
+@pytest.mark.django_db
+def test_post_images_are_served_immutable(rf, post_with_published_location):
+    url = post_with_published_location.image.url
+    response = post_image(rf.get(url), url.split("/posts/", 1)[1])
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что изображения постов отдаются с заголовком"
+        " `Cache-Control: immutable`."
+    )
+
+
+@pytest.mark.django_db
+def test_collect_media_garbage(post_with_published_location, storage):
+    orphan = storage.save("posts/orphan.png", ContentFile(b"orphan"))
+    call_command("collect_media_garbage", stdout=StringIO())
+    assert storage.exists(orphan), (
+        "Убедитесь, что недавно сохранённые файлы не удаляются."
+    )
+
+    call_command("collect_media_garbage", grace=-60, stdout=StringIO())
+    assert not storage.exists(orphan), (
+        "Убедитесь, что команда удаляет файлы, не привязанные к постам."
+    )
+    assert storage.exists(post_with_published_location.image.name)
@@ -0,0 +1,141 @@
+from email.mime.text import MIMEText
+
+import pytest
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import override_settings
+
+from core.management.commands import run_worker
+from core.models import Task
+from core.tasks import claim_task, task
+
+calls = []
+
+
+@task(name="tests.collect", max_attempts=2)
+def collect(value):
+    calls.append(value)
+
+
+@task(name="tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("Ошибка задачи")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_runs_queued_tasks():
+    calls.clear()
+    collect.delay(1)
+    collect.delay(2)
+    call_command("run_worker", "--once", "--concurrency", "1")
+    assert sorted(calls) == [1, 2]
+    assert set(Task.objects.values_list("status", flat=True)) == {Task.DONE}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_task_is_retried_then_marked_failed():
+    queued = explode.delay()
+    with override_settings(TASKS_RETRY_DELAY=0):
+        call_command("run_worker", "--once", "--concurrency", "1")
+    queued.refresh_from_db()
+    assert queued.status == Task.FAILED
+    assert queued.attempts == 2
+    assert "Ошибка задачи" in queued.last_error
+
+
+@pytest.mark.django_db
+def test_post_image_queues_renditions(post_with_published_location):
+    assert Task.objects.filter(
+        name="blog.tasks.generate_post_renditions",
+        args=[post_with_published_location.pk],
+    ).exists(), (
+        "Убедитесь, что обработка изображения поста ставится в очередь."
+    )
+
+
+@pytest.mark.django_db
+def test_post_saves_queue_renditions_once(post_with_published_location):
+    post = post_with_published_location
+    post.title = "Новый заголовок"
+    post.save()
+    assert Task.objects.filter(
+        name="blog.tasks.generate_post_renditions", args=[post.pk]
+    ).count() == 1, (
+        "Убедитесь, что повторное сохранение поста не ставит обработку"
+        " изображения в очередь второй раз."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(
+    EMAIL_BACKEND="core.mail.QueuedEmailBackend",
+    TASKS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+def test_queued_email_backend():
+    mail.send_mail("Тема", "Текст", "from@example.com", ["to@example.com"])
+    assert not mail.outbox
+    call_command("run_worker", "--once", "--concurrency", "1")
+    assert [message.subject for message in mail.outbox] == ["Тема"]
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(
+    EMAIL_BACKEND="core.mail.QueuedEmailBackend",
+    TASKS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+def test_queued_email_keeps_attachments_and_alternatives():
+    message = mail.EmailMultiAlternatives(
+        "Тема", "Текст", "from@example.com", ["to@example.com"]
+    )
+    message.attach_alternative("<p>Текст</p>", "text/html")
+    message.attach("notes.txt", "Заметки", "text/plain")
+    message.attach("photo.png", b"\x89PNG\r\n", "image/png")
+    message.send()
+    call_command("run_worker", "--once", "--concurrency", "1")
+    [sent] = mail.outbox
+    assert sent.alternatives == [("<p>Текст</p>", "text/html")]
+    assert sent.attachments == [
+        ("notes.txt", "Заметки", "text/plain"),
+        ("photo.png", b"\x89PNG\r\n", "image/png"),
+    ], "Убедитесь, что письма из очереди отправляются с вложениями."
+
+
+@pytest.mark.django_db
+@override_settings(EMAIL_BACKEND="core.mail.QueuedEmailBackend")
+def test_queued_email_rejects_mime_attachments():
+    message = mail.EmailMessage("Тема", "Текст", to=["to@example.com"])
+    message.attach(MIMEText("Заметки"))
+    with pytest.raises(ValueError):
+        message.send()
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(TASKS_POLL_INTERVAL=0)
+def test_worker_survives_database_errors(monkeypatch):
+    calls.clear()
+    collect.delay(1)
+    failures = [OperationalError("database is locked")]
+
+    def flaky_claim(worker):
+        if failures:
+            raise failures.pop()
+        return claim_task(worker)
+
+    monkeypatch.setattr(run_worker, "claim_task", flaky_claim)
+    call_command("run_worker", "--once", "--concurrency", "1")
+    assert calls == [1], (
+        "Убедитесь, что обработчик задач продолжает работу после"
+        " ошибки базы данных."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_crash_fails_command(monkeypatch):
+    def broken_claim(worker):
+        raise RuntimeError("Сбой")
+
+    monkeypatch.setattr(run_worker, "claim_task", broken_claim)
+    with pytest.raises(CommandError):
+        call_command("run_worker", "--once", "--concurrency", "1")
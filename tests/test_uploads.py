@@ -0,0 +1,98 @@
+import os
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, override_settings
+from PIL import Image
+
+from blog.forms import PostForm
+
+
+def make_image(size):
+    buffer = BytesIO()
+    Image.new("RGB", size).save(buffer, format="PNG")
+    return SimpleUploadedFile("image.png", buffer.getvalue(), "image/png")
+
+
+@pytest.mark.django_db
+@override_settings(POST_IMAGE_MAX_PIXELS=100 * 100)
+def test_image_pixel_limit():
+    form = PostForm(data={}, files={"image": make_image((101, 100))})
+    form.is_valid()
+    assert "image" in form.errors, (
+        "Убедитесь, что форма поста отклоняет изображения больше"
+        " `POST_IMAGE_MAX_PIXELS` пикселей."
+    )
+    form = PostForm(data={}, files={"image": make_image((100, 100))})
+    form.is_valid()
+    assert "image" not in form.errors
+
+
+@pytest.mark.django_db
+def test_oversized_upload_rejected(user_client, settings):
+    settings.POST_IMAGE_MAX_SIZE = 1024
+    image = SimpleUploadedFile("big.png", b"\0" * 200 * 1024, "image/png")
+    response = user_client.post("/posts/create/", data={"image": image})
+    form = response.context["form"]
+    assert form.errors["image"][0].startswith("Размер файла"), (
+        "Убедитесь, что форма поста отклоняет слишком большие файлы."
+    )
+
+
+def test_upload_handler_stops_writing_after_limit(settings):
+    from blog.uploads import LimitedTemporaryFileUploadHandler
+
+    settings.POST_IMAGE_MAX_SIZE = 1024
+    handler = LimitedTemporaryFileUploadHandler()
+    handler.new_file("image", "big.png", "image/png", None)
+    chunk = b"\0" * handler.chunk_size
+    for start in range(0, 4 * len(chunk), len(chunk)):
+        handler.receive_data_chunk(chunk, start)
+    uploaded = handler.file_complete(4 * len(chunk))
+    assert uploaded.size == 4 * len(chunk)
+    assert os.path.getsize(uploaded.temporary_file_path()) <= 1024, (
+        "Убедитесь, что загрузка сверх лимита не пишется на диск."
+    )
+    uploaded.close()
+
+
+@pytest.mark.django_db
+def test_edit_post_limits_upload(
+        user_client, settings, post_with_published_location
+):
+    settings.POST_IMAGE_MAX_SIZE = 1024
+    image = SimpleUploadedFile("big.png", b"\0" * 200 * 1024, "image/png")
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/edit/",
+        data={"image": image},
+    )
+    form = response.context["form"]
+    assert form.errors["image"][0].startswith("Размер файла"), (
+        "Убедитесь, что форма редактирования поста отклоняет слишком"
+        " большие файлы."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/posts/create/", "/posts/{id}/edit/"])
+def test_limited_upload_views_keep_csrf(
+        user, post_with_published_location, url
+):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post(url.format(id=post_with_published_location.id))
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        "Убедитесь, что страницы поста с ограничением загрузки"
+        " по-прежнему проверяют CSRF-токен."
+    )
+
+
+def test_upload_limit_is_not_global(settings):
+    assert "blog.uploads.LimitedTemporaryFileUploadHandler" not in (
+        settings.FILE_UPLOAD_HANDLERS
+    ), (
+        "Убедитесь, что лимит размера изображения поста не применяется"
+        " к остальным загрузкам, например в админке."
+    )
@@ -0,0 +1,39 @@
+import pytest
+from django.template import engines
+
+from core.warmup import warm_templates
+
+CACHED_LOADERS = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": engines["django"].engine.dirs,
+        "OPTIONS": {
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
+        },
+    },
+]
+
+
+@pytest.fixture
+def cached_engine(settings):
+    settings.TEMPLATES = CACHED_LOADERS
+    return engines["django"].engine
+
+
+def test_warm_templates_fills_cached_loader(cached_engine):
+    loader = cached_engine.template_loaders[0]
+    assert not loader.get_template_cache
+
+    loaded = warm_templates()
+
+    assert loaded > 0
+    assert "includes/post_card.html" in loader.get_template_cache, (
+        "Убедитесь, что warm_templates() компилирует шаблоны"
+        " из каталога templates/ в кэш загрузчика."
+    )
+    assert "base.html" in loader.get_template_cache